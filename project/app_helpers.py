@@ -0,0 +1,350 @@
+import json
+
+import streamlit as st
+
+from llm import Generation, cached_response, generate, parse_json_answer, prompt_feature
+from preflight import check_jd, check_resume, record_avoided
+from prompts import render_prompt
+from resilience import ModelUnavailable
+from sections import section_hash, select_sections
+from session_memory import recall, remember
+from uploads import UploadRejected, upload_digest
+
+MAX_UPLOAD_DIGESTS = 16
+
+
+# Function to get Gemini response. Answers to identical prompts are served from the response cache.
+def get_gemini_response(input):
+    return get_gemini_generation(input).text
+
+
+# The full generation behind get_gemini_response, for callers that need to know whether the answer was
+# cut off. Cached answers are complete by construction.
+def get_gemini_generation(input):
+    cached = cached_response(input)
+    if cached is not None:
+        return Generation(cached, prompt_feature(input), "cache", "cache", 0.0, True, 0, False)
+    with st.spinner("Analyzing..."):
+        try:
+            generation = generate(input, api_key=st.session_state.get("api_key") or None)
+        except ModelUnavailable as e:
+            st.error(str(e))
+            st.stop()
+    st.caption(f"Answered by {generation.model} ({generation.tier} tier) in {generation.seconds:.1f}s, "
+               f"{generation.output_tokens} output tokens")
+    if generation.truncated:
+        st.warning("The answer reached the output length limit for this feature and may be cut short.")
+    return generation
+
+
+# Extract and normalise a PDF once per file content. The raw and normalised text are cached
+# together, so reruns and other features reuse them without parsing the PDF again.
+@st.cache_data(max_entries=64, show_spinner=False)
+def load_pdf_document(digest, _uploaded_file):
+    # The PDF libraries are only loaded by features that read uploads
+    from extractors import extract_document
+    from text_normalize import normalize_pages
+
+    document = extract_document(_uploaded_file)
+    text, stats = normalize_pages(document.pages)
+    return {
+        "digest": digest,
+        "raw_text": document.text,
+        "text": text,
+        "stats": stats,
+        "backend": document.backend,
+        "page_count": document.page_count,
+        "quality": document.quality,
+    }
+
+
+# Content hash of an upload, computed once per uploaded file in this session instead of on every rerun
+def memoized_digest(uploaded_file):
+    digests = st.session_state.setdefault("upload_digests", {})
+    file_id = getattr(uploaded_file, "file_id", None)
+    if file_id is None:
+        return upload_digest(uploaded_file)
+    if file_id not in digests:
+        digests[file_id] = upload_digest(uploaded_file)
+        # Only recent uploads are worth remembering; drop the oldest
+        while len(digests) > MAX_UPLOAD_DIGESTS:
+            digests.pop(next(iter(digests)))
+    return digests[file_id]
+
+
+# Function to extract text from PDF, enforcing the upload size, page and text limits. st.cache_data does not
+# cache exceptions, so rejections are remembered per file content to avoid extracting a bad file on every rerun.
+def input_pdf_text(uploaded_file):
+    rejections = st.session_state.setdefault("upload_rejections", {})
+    try:
+        digest = memoized_digest(uploaded_file)
+        if digest in rejections:
+            raise UploadRejected(rejections[digest])
+        try:
+            document = load_pdf_document(digest, uploaded_file)
+        except UploadRejected as e:
+            rejections[digest] = str(e)
+            while len(rejections) > MAX_UPLOAD_DIGESTS:
+                rejections.pop(next(iter(rejections)))
+            raise
+        if not document["text"]:
+            st.error("No text could be extracted from this PDF. If it is a scanned document, "
+                     "please upload a text-based PDF.")
+            return None
+        stats = document["stats"]
+        st.caption(f"Extracted {document['page_count']} page(s) with {document['backend']}: "
+                   f"{stats['raw_chars']:,} → {stats['chars']:,} characters after clean-up "
+                   f"(~{stats['tokens']:,} tokens, {stats['token_reduction']:.0%} fewer)")
+        return document["text"]
+    except UploadRejected as e:
+        st.error(str(e))
+        return None
+    except Exception as e:
+        st.error(f"Error reading PDF: {str(e)}")
+        return None
+
+
+# Cheap local checks of a feature's inputs before any model call. Problems are shown and stop the call,
+# which is counted as avoided; warnings are shown and the call goes ahead.
+def passes_preflight(feature, resume=None, jd=None, resume_label="resume"):
+    checks = []
+    if resume is not None:
+        checks.append(check_resume(resume, resume_label))
+    if jd is not None:
+        checks.append(check_jd(jd))
+    reasons = []
+    for check in checks:
+        for message in check.problems.values():
+            st.error(message)
+        for message in check.warnings:
+            st.warning(message)
+        reasons.extend(check.problems)
+    if reasons:
+        record_avoided(feature, reasons)
+    return not reasons
+
+
+# The resume sections a feature consumes, instead of the whole resume, with a note of how much was kept
+def resume_context(text, section_names):
+    context, used = select_sections(text, section_names)
+    if used:
+        st.caption(f"Using the {', '.join(used)} section(s) of your resume "
+                   f"({len(context):,} of {len(text):,} characters).")
+    return context
+
+
+# Updated function to parse AI response
+def parse_ai_response(response):
+    try:
+        parsed = parse_json_answer(response)
+    except ValueError as e:
+        st.error(str(e))
+        st.error("Raw response:")
+        st.code(response.strip())
+        return None
+
+    # Convert percentage strings to floats
+    for key in ['JD Match', 'TechnicalSkills', 'SoftSkills', 'Experience', 'Education', 'Projects', 'ATS_Score',
+                'ATS_Compatibility_Score']:
+        if key in parsed and isinstance(parsed[key], str):
+            try:
+                parsed[key] = float(parsed[key].rstrip('%'))
+            except ValueError:
+                st.warning(f"Could not convert {key} to float. Keeping as string.")
+
+    return parsed
+
+
+# Function to suggest improvements
+def suggest_improvements(missing_keywords, job_description):
+    prompt = render_prompt("keyword_suggestions", missing_keywords=missing_keywords, jd=job_description)
+    suggestions = get_gemini_response(prompt)
+    return suggestions
+
+
+# Function to create radar chart
+def create_radar_chart(parsed_response):
+    categories = ['Technical Skills', 'Soft Skills', 'Experience', 'Education', 'Projects']
+    scores = []
+    for category in categories:
+        try:
+            score = float(parsed_response.get(category.replace(' ', ''), 0))
+            scores.append(score)
+        except ValueError:
+            st.warning(f"Invalid score for {category}. Using 0.")
+            scores.append(0)
+
+    import numpy as np
+    from matplotlib.figure import Figure
+
+    # Spread the categories evenly around the circle and close the outline
+    angles = np.linspace(0, 2 * np.pi, len(categories), endpoint=False)
+    angles, scores = np.append(angles, angles[0]), scores + scores[:1]
+    # A bare Figure is not registered with pyplot, so it is freed once rendered instead of piling up
+    # in pyplot's figure manager for the life of the process
+    fig = Figure(figsize=(6, 6))
+    ax = fig.add_subplot(projection='polar')
+    ax.plot(angles, scores)
+    ax.fill(angles, scores, alpha=0.25)
+    ax.set_xticks(angles[:-1], categories)
+    ax.set_ylim(0, 100)
+    ax.set_title('Resume Strength Analysis')
+    return fig
+
+
+# Local category scorer for the radar chart, built once per process
+@st.cache_resource(show_spinner=False)
+def get_category_scorer():
+    from category_scores import load_scorer
+
+    return load_scorer()
+
+
+# Radar chart of the locally computed category scores of a resume, optionally against a JD
+def show_strength_chart(resume_text, jd_text=None):
+    st.subheader("Resume Strength Analysis")
+    st.pyplot(create_radar_chart(get_category_scorer().score(resume_text, jd_text)))
+    st.caption("Category scores are computed locally from your resume's sections and keywords.")
+
+
+# Load the course catalogue index once per process
+@st.cache_resource(show_spinner=False)
+def get_course_index():
+    from course_catalog import load_index
+
+    return load_index()
+
+
+# Shared company profile cache, opened once per process
+@st.cache_resource(show_spinner=False)
+def get_company_cache():
+    from company_cache import CompanyProfileCache
+
+    return CompanyProfileCache()
+
+
+# Keyword index of analysed resumes and job descriptions, opened once per process
+@st.cache_resource(show_spinner=False)
+def get_keyword_index():
+    from keyword_index import KeywordIndex
+
+    return KeywordIndex()
+
+
+# Index id of a resume or job description, derived from its text so re-analyses update the same document
+def document_id(kind, text):
+    return f"{kind}:{section_hash(text)[:16]}"
+
+
+# Record the keywords of a resume (has) or job description (requires) in the keyword index. Features report
+# different subsets of a document's keywords, so each analysis adds to the ones already recorded.
+def index_keywords(kind, text, **fields):
+    get_keyword_index().add(document_id(kind, text), merge=True,
+                            **{field: list(values or []) for field, values in fields.items()})
+
+
+# Record one analysis of a resume against a job description as a match document keyed by both ids.
+# What is missing only holds for that pair; a new analysis of the same pair replaces it.
+def index_match(resume, jd, has, missing, requires):
+    candidate = document_id("candidate", resume).split(":", 1)[1]
+    get_keyword_index().add(f"match:{candidate}/{document_id('jd', jd).split(':', 1)[1]}",
+                            has=list(has or []), missing=list(missing or []), requires=list(requires or []))
+
+
+# Fingerprint of the inputs a result was computed from (texts, upload ids, normalised names)
+def input_fingerprint(inputs):
+    return section_hash("\x00".join(str(value or "") for value in inputs))
+
+
+# Keep a feature's latest result, and whatever its panel needs to render it, for this session so it
+# survives reruns caused by other widgets. Results count towards the session's memory cap and the least
+# recently used ones are evicted first. `inputs` are the inputs the result was computed from. A result
+# over the session cap is not kept; it is handed to this run's result panel only.
+def store_result(feature, result, inputs=(), **context):
+    entry = dict(context, result=result, inputs=input_fingerprint(inputs))
+    if not remember(f"result:{feature}", entry):
+        st.warning("This result is too large to keep in your session. It is shown below, but will be gone "
+                   "after your next action, so download it if you need it.")
+        st.session_state.setdefault("unstored_results", {})[feature] = entry
+
+
+def stored_result(feature):
+    return recall(f"result:{feature}")
+
+
+# Render a feature's stored result while the feature's current inputs are the ones it was computed from.
+# As a fragment, interactions inside the panel (the download button, expanders) rerun only the panel,
+# not the uploads, extraction and inputs above it.
+@st.fragment
+def result_panel(feature, render, inputs=()):
+    stored = st.session_state.get("unstored_results", {}).pop(feature, None) or stored_result(feature)
+    if stored is None:
+        return
+    stored = dict(stored)
+    if stored.pop("inputs") != input_fingerprint(inputs):
+        st.caption("The inputs have changed since the last analysis. Run it again to see updated results.")
+        return
+    render(**stored)
+
+
+# Updated function to add download button
+def add_download_button(content, filename):
+    st.download_button(
+        label="Download Results",
+        data=content,
+        file_name=f"{filename}.txt",
+        mime="text/plain"
+    )
+
+
+# Analyse a resume version. When this session already analysed an earlier version of the resume (against
+# the same JD), only the changed sections are re-scored and merged into the cached result.
+# Returns the result, the previous version (or None) and the names of the re-scored sections.
+def analyze_resume_version(template, text, jd_text=None):
+    from resume_versions import (can_reuse, diff_sections, format_sections, make_version, merge_ats_jd_revision,
+                                 merge_ats_revision)
+
+    state_key = f"resume_versions:{template}"
+    previous = recall(state_key)
+    jd_key = section_hash(jd_text) if jd_text else None
+    sections, changed, unchanged, removed = diff_sections(previous, text)
+
+    if can_reuse(previous, sections, changed, jd_key):
+        if not changed and not removed:
+            return previous["result"], previous, []
+        summary_keys = {"ats_resume": ["Strengths", "Improvements", "Formatting"],
+                        "ats_resume_jd": ["Improvement_Suggestions", "Overall_Assessment"]}[template]
+        prompt = render_prompt(f"{template}_revision", changed=format_sections(sections, changed),
+                               unchanged=unchanged, jd=jd_text,
+                               previous=json.dumps({k: previous["result"][k] for k in summary_keys}, indent=2))
+        revision = parse_ai_response(get_gemini_response(prompt))
+        if not revision:
+            return None, previous, changed
+        merge = merge_ats_revision if template == "ats_resume" else merge_ats_jd_revision
+        parsed_response = merge(previous, revision, sections, text)
+    else:
+        prompt = render_prompt(template, resume=text, jd=jd_text, section_names=list(sections))
+        parsed_response = parse_ai_response(get_gemini_response(prompt))
+        if not parsed_response:
+            return None, previous, list(sections)
+        changed = list(sections)
+        previous = previous if previous and previous["jd_key"] == jd_key else None
+
+    remember(state_key, make_version(text, parsed_response, previous, jd_key))
+    return parsed_response, previous, changed
+
+
+# Show the score of a resume version with its change since the previous version
+def show_version_score(label, score, score_key, previous, rescored):
+    delta = None
+    if previous:
+        try:
+            delta = round(float(score) - float(previous["result"][score_key]), 1)
+        except (TypeError, ValueError):
+            delta = None
+    st.metric(label, f"{score}/100", delta=delta)
+    if previous and not rescored:
+        st.caption(f"No changes since version {previous['number']}; showing its analysis.")
+    elif previous:
+        st.caption(f"Version {previous['number'] + 1}: re-scored {', '.join(rescored)}; "
+                   "other sections reused from the previous analysis.")
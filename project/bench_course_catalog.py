@@ -0,0 +1,78 @@
+import argparse
+import csv
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from course_catalog import CourseIndex, load_catalog, load_index
+
+VOCABULARY = [
+    "python", "sql", "java", "go", "rust", "kubernetes", "docker", "terraform", "aws", "azure", "spark",
+    "airflow", "kafka", "tableau", "power bi", "excel", "statistics", "machine learning", "deep learning",
+    "nlp", "react", "typescript", "linux", "security", "scrum", "leadership", "communication", "mlops",
+]
+
+
+# Write a synthetic catalogue of the given size so load and lookup cost can be measured at scale
+def write_synthetic_catalog(path, size, seed=0):
+    rng = random.Random(seed)
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=["title", "provider", "skills", "level", "description"])
+        writer.writeheader()
+        for i in range(size):
+            skills = rng.sample(VOCABULARY, 3)
+            writer.writerow({
+                "title": f"{skills[0].title()} course {i}",
+                "provider": f"Provider {i % 50}",
+                "skills": ";".join(skills),
+                "level": rng.choice(["Beginner", "Intermediate", "Advanced"]),
+                "description": f"Learn {skills[0]} together with {skills[1]} and {skills[2]}",
+            })
+
+
+def time_lookups(index, queries, repeat):
+    timings = []
+    for _ in range(repeat):
+        for query in queries:
+            started = time.perf_counter()
+            index.lookup(query)
+            timings.append(time.perf_counter() - started)
+    timings.sort()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark course catalogue loading and skill lookups")
+    parser.add_argument("--sizes", default="50,1000,10000,100000", help="Synthetic catalogue sizes")
+    parser.add_argument("--repeat", type=int, default=200, help="Lookup rounds over the query list")
+    args = parser.parse_args()
+
+    queries = VOCABULARY + ["k8s", "amazon web services", "project management", "public speaking"]
+    print(f"{'courses':>8} {'load ms':>9} {'index ms':>9} {'p50 us':>8} {'p99 us':>8} {'lookups/s':>10}")
+
+    started = time.perf_counter()
+    index = load_index()
+    bundled_ms = (time.perf_counter() - started) * 1000
+    timings = time_lookups(index, queries, args.repeat)
+    print(f"{len(index.courses):>8} {bundled_ms:>9.1f} {'-':>9} {statistics.median(timings) * 1e6:>8.1f} "
+          f"{timings[int(len(timings) * 0.99)] * 1e6:>8.1f} {len(timings) / sum(timings):>10.0f}  (bundled)")
+
+    with tempfile.TemporaryDirectory() as folder:
+        for size in (int(value) for value in args.sizes.split(",")):
+            path = os.path.join(folder, f"courses_{size}.csv")
+            write_synthetic_catalog(path, size)
+            started = time.perf_counter()
+            courses = load_catalog(path)
+            loaded = time.perf_counter()
+            index = CourseIndex(courses)
+            indexed = time.perf_counter()
+            timings = time_lookups(index, queries, max(1, args.repeat // 10))
+            print(f"{size:>8} {(loaded - started) * 1000:>9.1f} {(indexed - loaded) * 1000:>9.1f} "
+                  f"{statistics.median(timings) * 1e6:>8.1f} {timings[int(len(timings) * 0.99)] * 1e6:>8.1f} "
+                  f"{len(timings) / sum(timings):>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import argparse
+import glob
+import os
+import re
+import statistics
+import time
+
+from extractors import EXTRACTORS, extract_document
+from uploads import upload_limits
+
+WORD_RE = re.compile(r"[A-Za-z0-9][A-Za-z0-9+#.\-]*")
+
+
+# Compare the PDF extraction backends (and the auto strategy) over a folder of sample PDFs.
+# Quality is reported as the text-yield score and as word recall against the union of
+# words every backend found in the same document.
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PDF text extraction backends")
+    parser.add_argument("corpus", help="Folder containing sample PDF files")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per document and backend")
+    parser.add_argument("--backends", default=",".join(EXTRACTORS) + ",auto",
+                        help="Comma-separated backends to compare")
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(args.corpus, "**", "*.pdf"), recursive=True))
+    if not paths:
+        parser.error(f"No PDF files found under {args.corpus}")
+
+    backends = [name.strip() for name in args.backends.split(",")]
+    backends = [name for name in backends if name == "auto" or (name in EXTRACTORS and EXTRACTORS[name].available())]
+    limits = upload_limits()
+    limits["max_pages"] = limits["max_chars"] = float("inf")
+
+    results = {name: [] for name in backends}
+    for path in paths:
+        words_by_backend = {}
+        for name in backends:
+            timings = []
+            try:
+                for _ in range(args.repeat):
+                    started = time.perf_counter()
+                    document = extract_document(path, limits, strategy=name)
+                    timings.append(time.perf_counter() - started)
+            except Exception as e:
+                print(f"{name:>9} failed on {os.path.basename(path)}: {e}")
+                continue
+            words_by_backend[name] = set(WORD_RE.findall(document.text.lower()))
+            results[name].append({
+                "pages": document.page_count,
+                "seconds": statistics.median(timings),
+                "quality": document.quality,
+                "backend": document.backend,
+            })
+        reference = set().union(*words_by_backend.values()) if words_by_backend else set()
+        for name, words in words_by_backend.items():
+            results[name][-1]["recall"] = len(words) / len(reference) if reference else 0.0
+
+    print(f"\n{len(paths)} documents, median of {args.repeat} runs each\n")
+    print(f"{'backend':>9} {'docs':>5} {'pages/s':>9} {'ms/doc':>8} {'yield':>6} {'recall':>7} {'empty':>6}")
+    for name, rows in results.items():
+        if not rows:
+            continue
+        seconds = sum(row["seconds"] for row in rows)
+        pages = sum(row["pages"] for row in rows)
+        print(f"{name:>9} {len(rows):>5} {pages / seconds if seconds else 0:>9.1f} "
+              f"{1000 * seconds / len(rows):>8.1f} "
+              f"{statistics.mean(row['quality'] for row in rows):>6.2f} "
+              f"{statistics.mean(row['recall'] for row in rows):>7.2f} "
+              f"{sum(row['quality'] == 0 for row in rows):>6}")
+    if results.get("auto"):
+        chosen = {}
+        for row in results["auto"]:
+            chosen[row["backend"]] = chosen.get(row["backend"], 0) + 1
+        print("\nauto strategy picked: " + ", ".join(f"{name} x{count}" for name, count in chosen.items()))
+
+
+if __name__ == "__main__":
+    main()
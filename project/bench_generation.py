@@ -0,0 +1,106 @@
+import argparse
+import json
+import os
+import sys
+
+from dotenv import load_dotenv
+
+import llm
+from generation_profiles import generation_config, is_deterministic, output_token_report
+from prompts import PROMPTS, render_prompt
+
+SAMPLE_RESUME = """Jane Doe
+Data Analyst
+
+Summary
+Data analyst with five years of experience turning raw data into dashboards and decisions.
+
+Skills
+Python, SQL, Tableau, Excel, statistics
+
+Experience
+Acme Analytics - Data Analyst (2019 - present)
+Built weekly revenue dashboards in Tableau used by 40 managers.
+Automated reporting pipelines in Python, saving 10 hours a week.
+
+Education
+BSc Mathematics, University of Leeds"""
+
+SAMPLE_JD = ("We are hiring a data analyst with strong SQL and Python skills, experience with Tableau or Power BI "
+             "dashboards, some exposure to cloud data warehouses, and the ability to explain insights to "
+             "stakeholders.")
+
+
+# One representative value per template field, so every registered prompt can be rendered
+def sample_values(resume, jd):
+    return {
+        "resume": resume,
+        "jd": jd,
+        "section_names": ["Summary", "Skills", "Experience", "Education"],
+        "changed": "[Skills]\nPython, SQL, Tableau, Power BI, dbt",
+        "unchanged": ["Summary", "Experience", "Education"],
+        "previous": json.dumps({"ATS_Score": 72, "Section_Scores": {"Skills": 65}}),
+        "missing_keywords": ["Power BI", "Snowflake"],
+        "content": resume.split("\n\n", 2)[1],
+        "paragraphs": "[1]\n" + resume.split("\n\n", 2)[1],
+        "company": "Acme Analytics",
+        "profile": resume,
+        "questions": "1. Tell me about a dashboard you built.\n2. How do you handle messy data?",
+    }
+
+
+# Call a feature `runs` times with the given settings, bypassing the response cache
+def run_feature(prompt, config, runs, api_key):
+    generations = []
+    for _ in range(runs):
+        llm.RESPONSE_CACHE.clear()
+        generations.append(llm.generate(prompt, config=config, api_key=api_key))
+    return generations
+
+
+# Measure output tokens per feature with model defaults and with the configured profile
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Compare output tokens per feature with and without "
+                                                 "the generation profiles")
+    parser.add_argument("--features", default=",".join(PROMPTS), help="Comma-separated prompt templates")
+    parser.add_argument("--runs", type=int, default=3, help="Calls per feature and setting")
+    parser.add_argument("--resume", help="Text file with a resume to use instead of the built-in sample")
+    parser.add_argument("--jd", help="Text file with a job description to use instead of the built-in sample")
+    args = parser.parse_args()
+
+    api_key = os.getenv("GOOGLE_API_KEY")
+    if os.getenv("LLM_BACKEND") != "stub":
+        if not api_key and not len(llm.KEY_POOL):
+            sys.exit("Set GOOGLE_API_KEY or GEMINI_API_KEYS, or LLM_BACKEND=stub to run offline")
+
+    resume = open(args.resume, encoding="utf-8").read() if args.resume else SAMPLE_RESUME
+    jd = open(args.jd, encoding="utf-8").read() if args.jd else SAMPLE_JD
+    values = sample_values(resume, jd)
+
+    baseline = {}
+    profiled = []
+    distinct = {}
+    for feature in (name.strip() for name in args.features.split(",")):
+        prompt = render_prompt(feature, **values)
+        before = run_feature(prompt, {}, args.runs, api_key)
+        baseline[feature] = sum(row.output_tokens for row in before) / len(before)
+        after = run_feature(prompt, generation_config(feature, llm.PROFILES), args.runs, api_key)
+        profiled.extend(after)
+        distinct[feature] = len({row.text for row in after})
+
+    report = output_token_report(profiled, llm.PROFILES, baseline)
+    print(f"{'feature':<24} {'uncapped':>8} {'profile':>8} {'cap':>6} {'saved':>7} {'capped':>6} {'answers':>7}")
+    for feature, row in report.items():
+        deterministic = is_deterministic(generation_config(feature, llm.PROFILES))
+        saved = 100 * row["saved_per_call"] / baseline[feature] if baseline[feature] else 0.0
+        print(f"{feature:<24} {baseline[feature]:>8.0f} {row['mean_tokens']:>8.0f} {row['cap'] or '-':>6} "
+              f"{saved:>6.0f}% {row['capped']:>6} {distinct[feature]:>5}{' *' if deterministic else '  '}")
+    total_before = sum(baseline[feature] for feature in report)
+    total_after = sum(row["mean_tokens"] for row in report.values())
+    print(f"\nOutput tokens per round of features: {total_before:.0f} -> {total_after:.0f}")
+    print("* deterministic profile: expect 1 distinct answer per feature")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+import importlib.util
+import subprocess
+import sys
+
+# Libraries the app installs on first start when they are missing: (module to look for, package to install)
+REQUIRED = [("matplotlib", "matplotlib"), ("PyPDF2", "PyPDF2"), ("google.generativeai", "google-generativeai")]
+
+
+def install(package):
+    subprocess.check_call([sys.executable, "-m", "pip", "install", package])
+
+
+# Ensure required libraries are installed. Only their presence is checked here; feature modules
+# import them when a feature that needs them is selected.
+def ensure_installed():
+    for module, package in REQUIRED:
+        try:
+            found = importlib.util.find_spec(module) is not None
+        except ImportError:
+            found = False
+        if not found:
+            install(package)
+
+
+# Runs on import, so the app's entry point only has to import this module before its own modules
+ensure_installed()
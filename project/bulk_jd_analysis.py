@@ -0,0 +1,150 @@
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pandas as pd
+from dotenv import load_dotenv
+
+from cassette import cassette_mode
+from keyword_index import KeywordIndex
+from llm import KEY_POOL, generate_text, parse_json_answer
+from prompts import render_prompt
+from sections import section_hash
+
+# List fields of the analyze_jd answer, stored as list columns
+FIELDS = ["Essential_Skills", "Key_Qualifications", "Main_Responsibilities", "Company_Culture", "Resume_Keywords"]
+# Frequency tables written after each run: file name and the field they count
+TABLES = {"skills": "Essential_Skills", "qualifications": "Key_Qualifications", "keywords": "Resume_Keywords"}
+
+
+def read_postings(path, text_column, id_column, group_by):
+    frame = pd.read_parquet(path) if path.endswith((".parquet", ".pq")) else pd.read_csv(path)
+    missing = [column for column in [text_column] + group_by if column not in frame.columns]
+    if missing:
+        sys.exit(f"{path} has no column(s) {', '.join(missing)}; columns are {', '.join(map(str, frame.columns))}")
+    frame = frame[frame[text_column].fillna("").str.strip() != ""].copy()
+    frame["jd_hash"] = frame[text_column].map(section_hash)
+    frame["jd_id"] = frame[id_column].astype(str) if id_column in frame.columns else frame["jd_hash"].str[:12]
+    return frame.rename(columns={text_column: "text"})[["jd_id", "jd_hash", "text"] + group_by]
+
+
+# Every analysis written so far, newest wins for a posting analysed more than once
+def load_results(output_dir):
+    parts = sorted(glob.glob(os.path.join(output_dir, "parts", "*.parquet")))
+    if not parts:
+        return pd.DataFrame(columns=["jd_id", "jd_hash", "analyzed_at"] + FIELDS)
+    results = pd.concat([pd.read_parquet(part) for part in parts], ignore_index=True)
+    return results.drop_duplicates("jd_hash", keep="last").reset_index(drop=True)
+
+
+def _as_list(value):
+    if isinstance(value, list):
+        return [str(item).strip() for item in value if str(item).strip()]
+    return [str(value).strip()] if value else []
+
+
+# Analyse one posting; runs in a worker thread
+def analyze_posting(text, api_key):
+    answer = parse_json_answer(generate_text(render_prompt("analyze_jd", jd=text), api_key=api_key))
+    return {field: _as_list(answer.get(field)) for field in FIELDS}
+
+
+# How many postings mention each value of a list field, given one row per posting. Values are matched
+# case-insensitively and shown with their most common spelling; with group_by, counts and shares are per group.
+def frequency_table(postings, field, group_by=()):
+    group_by = list(group_by)
+    rows = postings[group_by + [field]].explode(field).dropna(subset=[field])
+    rows["key"] = rows[field].str.casefold().str.strip()
+    rows = rows.reset_index().drop_duplicates(["index", "key"])
+    spelling = rows.groupby("key")[field].agg(lambda values: values.value_counts().index[0])
+    if group_by:
+        counts = rows.groupby(group_by)["key"].value_counts().rename("postings").reset_index()
+        totals = postings.groupby(group_by).size().rename("total").reset_index()
+        counts = counts.merge(totals, on=group_by)
+    else:
+        counts = rows["key"].value_counts().rename("postings").reset_index()
+        counts["total"] = len(postings)
+    counts["share"] = (counts["postings"] / counts["total"]).round(3)
+    counts.insert(len(group_by), field, counts["key"].map(spelling))
+    ascending = [True] * len(group_by) + [False]
+    return counts.drop(columns=["key", "total"]).sort_values(group_by + ["postings"], ascending=ascending)
+
+
+# Analyse job postings from a CSV or Parquet file in bulk and aggregate which skills dominate.
+# Results accumulate in the output directory, so re-running with new postings only analyses those.
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Analyse job descriptions in bulk and count skill frequencies")
+    parser.add_argument("postings", help="CSV or Parquet file with one job description per row")
+    parser.add_argument("--output-dir", default="jd_analysis", help="Where results and frequency tables go")
+    parser.add_argument("--text-column", default="description", help="Column holding the job description")
+    parser.add_argument("--id-column", default="id", help="Column identifying each posting, if present")
+    parser.add_argument("--group-by", default="", help="Comma-separated columns to break frequencies down by")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent model calls")
+    parser.add_argument("--refresh", action="store_true", help="Re-analyse postings that already have results")
+    parser.add_argument("--index", action="store_true", help="Add the analysed skills to the keyword index")
+    parser.add_argument("--top", type=int, default=15, help="Skills to print")
+    args = parser.parse_args()
+
+    api_key = os.getenv("GOOGLE_API_KEY")
+    if not api_key and not len(KEY_POOL) and os.getenv("LLM_BACKEND") != "stub" and cassette_mode() != "replay":
+        sys.exit("Set GOOGLE_API_KEY or GEMINI_API_KEYS, or LLM_BACKEND=stub or LLM_CASSETTE_MODE=replay "
+                 "to run offline")
+
+    group_by = [column.strip() for column in args.group_by.split(",") if column.strip()]
+    postings = read_postings(args.postings, args.text_column, args.id_column, group_by)
+    results = load_results(args.output_dir)
+    pending = postings.drop_duplicates("jd_hash")
+    if not args.refresh:
+        pending = pending[~pending["jd_hash"].isin(results["jd_hash"])]
+    print(f"{len(postings)} postings, {len(postings) - len(pending)} already analysed or duplicated, "
+          f"analysing {len(pending)}")
+
+    rows = []
+    failed = 0
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        futures = {executor.submit(analyze_posting, posting.text, api_key): posting
+                   for posting in pending.itertuples(index=False)}
+        for done, future in enumerate(as_completed(futures), 1):
+            posting = futures[future]
+            try:
+                rows.append(dict(jd_id=posting.jd_id, jd_hash=posting.jd_hash,
+                                 analyzed_at=pd.Timestamp.now(tz="UTC"), **future.result()))
+            except Exception as e:
+                failed += 1
+                print(f"[{done}/{len(pending)}] {posting.jd_id} failed: {e}", file=sys.stderr)
+            if done % 100 == 0:
+                print(f"[{done}/{len(pending)}] {done / (time.perf_counter() - started):.1f} postings/s")
+
+    if rows:
+        os.makedirs(os.path.join(args.output_dir, "parts"), exist_ok=True)
+        name = f"part-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.parquet"
+        part = os.path.join(args.output_dir, "parts", name)
+        pd.DataFrame(rows).to_parquet(part, index=False)
+        results = load_results(args.output_dir)
+    print(f"Analysed {len(rows)}, {failed} failed; {len(results)} postings in {args.output_dir}")
+    if args.index and rows:
+        # Same document ids as the app uses for a pasted JD, adding to the keywords the app recorded for it
+        KeywordIndex().add_many(((f"jd:{row['jd_hash'][:16]}",
+                                  {"requires": row["Essential_Skills"] + row["Resume_Keywords"]}) for row in rows),
+                                merge=True)
+    if results.empty:
+        return
+
+    # Frequencies cover every analysed posting in the input, including reposts of the same text
+    analysed = postings.drop(columns=["text"]).merge(results.drop(columns=["jd_id"]), on="jd_hash")
+    for name, field in TABLES.items():
+        table = frequency_table(analysed, field, group_by)
+        table.to_csv(os.path.join(args.output_dir, f"{name}.csv"), index=False)
+    top = frequency_table(analysed, "Essential_Skills").head(args.top)
+    print(f"\nTop skills across {len(analysed)} postings:")
+    for row in top.itertuples(index=False):
+        print(f"  {row.Essential_Skills:<30} {row.postings:>6} {row.share:>7.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import statistics
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+from resilience import ModelUnavailable
+
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "cassettes")
+
+
+# Raised in replay mode for a prompt the cassettes have no recording of
+class CassetteMiss(ModelUnavailable):
+    pass
+
+
+def cassette_mode():
+    return os.getenv("LLM_CASSETTE_MODE", "off")
+
+
+def cassette_dir():
+    return os.getenv("LLM_CASSETTE_DIR", DEFAULT_DIR)
+
+
+# Recording key of a prompt: a hash of its full text, so a recorded prompt can be replayed as a plain string
+def prompt_key(prompt):
+    return hashlib.sha256(str(prompt).encode("utf-8")).hexdigest()
+
+
+# Model calls recorded as JSON lines: prompt, response, latency and token usage. Each process writes its
+# own file; replay reads every file in the directory and serves the recordings of a prompt in the order
+# they were made, cycling when the prompt is asked for more often than it was recorded.
+class Cassette:
+    def __init__(self, directory=None):
+        self.directory = directory or cassette_dir()
+        self.path = os.path.join(self.directory, f"cassette-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.jsonl")
+        self.entries = None
+        self._served = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def record(self, prompt, model_name, response, seconds, input_tokens, output_tokens, truncated):
+        entry = {"key": prompt_key(prompt), "feature": getattr(prompt, "name", "default"), "model": model_name,
+                 "prompt": str(prompt), "response": response, "seconds": round(seconds, 4),
+                 "input_tokens": input_tokens, "output_tokens": output_tokens, "truncated": truncated,
+                 "recorded_at": time.time()}
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as handle:
+                handle.write(json.dumps(entry) + "\n")
+
+    def load(self):
+        entries = defaultdict(list)
+        for path in sorted(glob.glob(os.path.join(self.directory, "*.jsonl"))):
+            with open(path, encoding="utf-8") as handle:
+                for line in handle:
+                    if line.strip():
+                        entry = json.loads(line)
+                        entries[entry["key"]].append(entry)
+        return entries
+
+    # The next recording of a prompt, or CassetteMiss
+    def lookup(self, prompt):
+        key = prompt_key(prompt)
+        with self._lock:
+            if self.entries is None:
+                self.entries = self.load()
+            recordings = self.entries.get(key)
+            if not recordings:
+                raise CassetteMiss(f"No recorded answer for this {getattr(prompt, 'name', 'default')} prompt "
+                                   f"in {self.directory}.")
+            entry = recordings[self._served[key] % len(recordings)]
+            self._served[key] += 1
+        return entry
+
+    # Serve a recording with its original latency times LLM_CASSETTE_TIME_SCALE (0 answers at once)
+    def replay(self, prompt):
+        entry = self.lookup(prompt)
+        time.sleep(entry["seconds"] * float(os.getenv("LLM_CASSETTE_TIME_SCALE", "1")))
+        return entry["response"], entry["output_tokens"], entry["truncated"]
+
+
+def _percentile(values, share):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * share))]
+
+
+# Per-feature summary of the recordings: calls, latency and token usage
+def stats(entries):
+    by_feature = defaultdict(list)
+    for recordings in entries.values():
+        for entry in recordings:
+            by_feature[entry["feature"]].append(entry)
+    print(f"{'feature':<24} {'calls':>6} {'p50 s':>7} {'p95 s':>7} {'in tok':>8} {'out tok':>8} {'cut':>4}")
+    for feature, rows in sorted(by_feature.items()):
+        seconds = [row["seconds"] for row in rows]
+        print(f"{feature:<24} {len(rows):>6} {statistics.median(seconds):>7.2f} {_percentile(seconds, 0.95):>7.2f} "
+              f"{statistics.mean(row['input_tokens'] for row in rows):>8.0f} "
+              f"{statistics.mean(row['output_tokens'] for row in rows):>8.0f} "
+              f"{sum(row['truncated'] for row in rows):>4}")
+
+
+# Replay every recorded call through generate() and parse the answers of JSON features, with the
+# recorded calls' latencies scaled by LLM_CASSETTE_TIME_SCALE. Reports throughput and parse failures.
+def replay_all(entries, workers):
+    os.environ["LLM_CASSETTE_MODE"] = "replay"
+    from llm import generate, parse_json_answer
+
+    recordings = [entry for rows in entries.values() for entry in rows]
+    recordings.sort(key=lambda entry: entry["recorded_at"])
+    failures = deque()
+    latencies = deque()
+
+    def run(entry):
+        started = time.perf_counter()
+        text = generate(entry["prompt"], feature=entry["feature"], model_name=entry["model"]).text
+        latencies.append(time.perf_counter() - started)
+        if text.lstrip().startswith(("{", "```")):
+            try:
+                parse_json_answer(text)
+            except ValueError as e:
+                failures.append(f"{entry['feature']} ({entry['key'][:12]}): {e}")
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(run, recordings))
+    elapsed = time.perf_counter() - started
+    print(f"replayed {len(recordings)} call(s) in {elapsed:.1f}s ({len(recordings) / elapsed:.1f} calls/s), "
+          f"p50 {statistics.median(latencies) * 1000:.0f} ms, p95 {_percentile(latencies, 0.95) * 1000:.0f} ms")
+    print(f"{len(failures)} JSON answer(s) failed to parse")
+    for line in list(failures)[:20]:
+        print(f"  {line}")
+    return not failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect and replay recorded model calls. Record them by running "
+                                                 "the app or a batch tool with LLM_CASSETTE_MODE=record.")
+    parser.add_argument("--dir", help=f"Cassette directory (default: LLM_CASSETTE_DIR or {DEFAULT_DIR})")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("stats", help="Calls, latency and tokens per feature")
+    replay = commands.add_parser("replay", help="Replay every recorded call and check the JSON answers parse")
+    replay.add_argument("--workers", type=int, default=8, help="Concurrent replayed calls")
+    replay.add_argument("--time-scale", type=float, help="Multiply recorded latencies, e.g. 0 or 0.1")
+    args = parser.parse_args()
+
+    if args.dir:
+        os.environ["LLM_CASSETTE_DIR"] = args.dir
+    entries = Cassette().load()
+    if not entries:
+        parser.error(f"No recordings in {cassette_dir()}")
+    if args.command == "stats":
+        stats(entries)
+        return
+    if args.time_scale is not None:
+        os.environ["LLM_CASSETTE_TIME_SCALE"] = str(args.time_scale)
+    if not replay_all(entries, args.workers):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import os
+import re
+from datetime import date
+
+import numpy as np
+
+from course_catalog import DEFAULT_CATALOG, load_catalog, tokenize
+from sections import segment_resume
+
+CATEGORIES = ["TechnicalSkills", "SoftSkills", "Experience", "Education", "Projects"]
+SOFT_SKILLS = [
+    "communication", "leadership", "teamwork", "collaboration", "problem solving", "critical thinking",
+    "stakeholder management", "presentation", "mentoring", "negotiation", "time management", "adaptability",
+    "creativity", "attention to detail", "project management", "decision making", "conflict resolution",
+    "customer focus", "ownership", "coaching",
+]
+YEAR_RE = re.compile(r"\b(19[5-9]\d|20[0-4]\d)\b")
+PRESENT_RE = re.compile(r"\b(present|current|now|today)\b", re.IGNORECASE)
+DEGREE_RE = re.compile(r"\b(bachelor|master|ph\.?d|doctorate|b\.?sc|m\.?sc|b\.?a|m\.?a|b\.?s|m\.?s|mba|b\.?tech|"
+                       r"m\.?tech|b\.?e|degree|diploma)\b", re.IGNORECASE)
+DIGIT_RE = re.compile(r"\d")
+MAX_PHRASE_WORDS = 3
+
+# Per-resume statistics, in column order, and how much each contributes to each category score.
+# Every statistic is scaled to 0..1 and every category's weights sum to 1.
+STATS = ["tech_match", "tech_breadth", "soft_match", "soft_breadth", "years", "quantified", "experience_length",
+         "degree", "education_length", "certifications", "project_length", "project_items", "project_tech"]
+WEIGHTS = np.array([
+    # Tech  Soft  Exp   Edu   Proj
+    [0.70, 0.00, 0.00, 0.00, 0.00],  # tech_match
+    [0.30, 0.00, 0.00, 0.00, 0.00],  # tech_breadth
+    [0.00, 0.70, 0.00, 0.00, 0.00],  # soft_match
+    [0.00, 0.30, 0.00, 0.00, 0.00],  # soft_breadth
+    [0.00, 0.00, 0.45, 0.00, 0.00],  # years
+    [0.00, 0.00, 0.30, 0.00, 0.00],  # quantified
+    [0.00, 0.00, 0.25, 0.00, 0.00],  # experience_length
+    [0.00, 0.00, 0.00, 0.60, 0.00],  # degree
+    [0.00, 0.00, 0.00, 0.15, 0.00],  # education_length
+    [0.00, 0.00, 0.00, 0.25, 0.00],  # certifications
+    [0.00, 0.00, 0.00, 0.00, 0.35],  # project_length
+    [0.00, 0.00, 0.00, 0.00, 0.25],  # project_items
+    [0.00, 0.00, 0.00, 0.00, 0.40],  # project_tech
+])
+# Value at which each statistic counts as full marks, for the ones that are counts or lengths
+SATURATION = {"tech_breadth": 15, "soft_breadth": 6, "years": 8, "experience_length": 1500, "education_length": 200,
+              "certifications": 3, "project_length": 800, "project_items": 4, "project_tech": 6}
+
+
+# All one- to three-word phrases of a text, normalised like the course catalogue
+def phrases(text):
+    tokens = tokenize(text or "")
+    found = set()
+    for size in range(1, MAX_PHRASE_WORDS + 1):
+        found.update(" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1))
+    return found
+
+
+def _lines(text):
+    return [line for line in (text or "").splitlines() if line.strip()]
+
+
+# Scores resumes 0-100 on the five radar chart categories from keyword and section statistics, locally
+# and without a model call. Keyword presence is a resumes x terms matrix, so a batch is scored at once.
+class CategoryScorer:
+    def __init__(self, technical_terms, soft_terms=SOFT_SKILLS):
+        technical = {" ".join(tokenize(term)) for term in technical_terms} - {""}
+        soft = {" ".join(tokenize(term)) for term in soft_terms} - {""}
+        self.terms = sorted(technical - soft) + sorted(soft)
+        self.term_ids = {term: i for i, term in enumerate(self.terms)}
+        self.is_soft = np.array([term in soft for term in self.terms])
+
+    def presence(self, texts):
+        matrix = np.zeros((len(texts), len(self.terms)), dtype=bool)
+        for row, text in enumerate(texts):
+            ids = [self.term_ids[phrase] for phrase in phrases(text) if phrase in self.term_ids]
+            matrix[row, ids] = True
+        return matrix
+
+    def _section_stats(self, sections, today_year):
+        experience = sections.get("Experience", "")
+        years = [int(year) for year in YEAR_RE.findall(experience)]
+        if years and PRESENT_RE.search(experience):
+            years.append(today_year)
+        lines = _lines(experience)
+        return [
+            max(years) - min(years) if years else 0,
+            sum(1 for line in lines if DIGIT_RE.search(line)) / len(lines) if lines else 0.0,
+            len(experience),
+            1.0 if DEGREE_RE.search(sections.get("Education", "")) else 0.0,
+            len(sections.get("Education", "")),
+            len(_lines(sections.get("Certifications", ""))),
+            len(sections.get("Projects", "")),
+            len(_lines(sections.get("Projects", ""))),
+        ]
+
+    # Scores for a batch of resume texts against an optional job description: an array of
+    # shape (resumes, 5) in CATEGORIES order
+    def score_batch(self, resumes, jd=None):
+        segmented = [segment_resume(text) for text in resumes]
+        resume_terms = self.presence(resumes)
+        project_terms = self.presence([sections.get("Projects", "") for sections in segmented])
+        wanted = self.presence([jd or ""])[0]
+
+        technical = ~self.is_soft
+        stats = np.zeros((len(resumes), len(STATS)))
+        for column, mask in ((0, technical), (2, self.is_soft)):
+            breadth = resume_terms[:, mask].sum(axis=1)
+            jd_terms = (wanted & mask).sum()
+            matched = resume_terms[:, wanted & mask].sum(axis=1)
+            if jd_terms:
+                stats[:, column] = matched / jd_terms
+            else:
+                stats[:, column] = np.minimum(breadth / SATURATION[STATS[column + 1]], 1.0)
+            stats[:, column + 1] = breadth
+        today_year = date.today().year
+        stats[:, 4:12] = [self._section_stats(sections, today_year) for sections in segmented]
+        stats[:, 12] = project_terms[:, technical].sum(axis=1)
+
+        for column, name in enumerate(STATS):
+            if name in SATURATION:
+                stats[:, column] = np.minimum(stats[:, column] / SATURATION[name], 1.0)
+        return np.round(np.clip(stats @ WEIGHTS, 0, 1) * 100, 1)
+
+    def score(self, resume, jd=None):
+        return dict(zip(CATEGORIES, self.score_batch([resume], jd)[0].tolist()))
+
+
+# Scorer whose technical vocabulary is every skill listed in the course catalogue
+def load_scorer(path=None):
+    courses = load_catalog(path or os.getenv("COURSE_CATALOG_PATH", DEFAULT_CATALOG))
+    return CategoryScorer({skill for course in courses for skill in course["skills"]})
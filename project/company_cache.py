@@ -0,0 +1,81 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from cache import TTLCache
+from prompts import PROMPTS
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "company_cache.sqlite3")
+LEGAL_SUFFIXES = {
+    "inc", "incorporated", "corp", "corporation", "co", "company", "ltd", "limited", "llc", "llp", "lp", "plc",
+    "pvt", "private", "gmbh", "ag", "sa", "sas", "srl", "bv", "nv", "oy", "ab", "as", "kk", "pte", "pty", "group",
+    "holdings",
+}
+PUNCTUATION_RE = re.compile(r"[^\w\s&]")
+
+
+# Canonical cache key for a company name: "The Walt Disney Company" and "walt disney co." map to the same entry
+def normalize_company_name(name):
+    words = PUNCTUATION_RE.sub(" ", name.casefold().replace("&", " & ")).split()
+    if words and words[0] == "the":
+        words = words[1:]
+    while len(words) > 1 and words[-1] in LEGAL_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+# Company profiles persisted in SQLite so the warm-up job and every app process share them,
+# with a small in-process layer in front for the most popular lookups
+class CompanyProfileCache:
+    def __init__(self, path=None, ttl=None):
+        self.path = path or os.getenv("COMPANY_CACHE_PATH", DEFAULT_PATH)
+        self.ttl = ttl if ttl is not None else float(os.getenv("COMPANY_CACHE_TTL_DAYS", "30")) * 86400
+        self.version = PROMPTS["company_info"].version
+        self.memory = TTLCache(maxsize=1024, ttl=min(self.ttl, 3600))
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS company_profiles ("
+                "key TEXT PRIMARY KEY, name TEXT, profile TEXT, version INTEGER, created_at REAL)"
+            )
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # Return (profile, created_at) for a company, or None when missing, stale or from an older prompt version
+    def get(self, name):
+        key = normalize_company_name(name)
+        entry = self.memory.get(key)
+        if entry is not None:
+            return entry
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT profile, created_at FROM company_profiles WHERE key = ? AND version = ? AND created_at > ?",
+                (key, self.version, time.time() - self.ttl),
+            ).fetchone()
+        if row is None:
+            return None
+        self.memory.set(key, row)
+        return row
+
+    def set(self, name, profile):
+        key = normalize_company_name(name)
+        if not key:
+            raise ValueError("A company name is needed to cache a profile")
+        entry = (profile, time.time())
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO company_profiles (key, name, profile, version, created_at) VALUES (?, ?, ?, ?, ?)",
+                (key, name.strip(), profile, self.version, entry[1]),
+            )
+        self.memory.set(key, entry)
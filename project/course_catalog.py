@@ -0,0 +1,94 @@
+import csv
+import json
+import math
+import os
+import re
+from collections import defaultdict
+
+DEFAULT_CATALOG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "courses.csv")
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+# Field weights: a match on a course's listed skills counts more than a match in its title or description
+FIELD_WEIGHTS = {"skills": 3.0, "title": 2.0, "description": 1.0}
+ALIASES = {
+    "js": "javascript", "ts": "typescript", "k8s": "kubernetes", "ml": "machine learning",
+    "dl": "deep learning", "nlp": "natural language processing", "gcp": "google cloud",
+    "aws": "amazon web services", "postgres": "postgresql", "powerbi": "power bi",
+}
+ALIAS_RE = re.compile(r"(?<![a-z0-9])(" + "|".join(map(re.escape, ALIASES)) + r")(?![a-z0-9])")
+STOPWORDS = {"and", "or", "of", "the", "for", "with", "in", "to", "a", "an", "on", "using", "skills", "experience"}
+
+
+def tokenize(text):
+    text = ALIAS_RE.sub(lambda match: ALIASES[match.group(1)], text.lower())
+    return [token.rstrip(".") for token in TOKEN_RE.findall(text) if token.rstrip(".") not in STOPWORDS]
+
+
+# Read a catalogue from CSV or JSON. Each course needs a title and provider; skills are separated by ";".
+def load_catalog(path):
+    if path.endswith(".json"):
+        with open(path, encoding="utf-8") as handle:
+            rows = json.load(handle)
+    else:
+        with open(path, newline="", encoding="utf-8") as handle:
+            rows = list(csv.DictReader(handle))
+    courses = []
+    for row in rows:
+        skills = row.get("skills") or []
+        if isinstance(skills, str):
+            skills = [skill.strip() for skill in skills.split(";") if skill.strip()]
+        courses.append({
+            "title": row["title"].strip(),
+            "provider": row["provider"].strip(),
+            "skills": skills,
+            "description": (row.get("description") or "").strip(),
+            "level": (row.get("level") or "").strip(),
+        })
+    return courses
+
+
+# In-memory inverted index from skill tokens to courses, scored with a field-weighted TF-IDF
+class CourseIndex:
+    def __init__(self, courses):
+        self.courses = courses
+        self.postings = defaultdict(dict)
+        self.exact_skills = defaultdict(set)
+        for course_id, course in enumerate(courses):
+            fields = {
+                "skills": " ".join(course["skills"]),
+                "title": course["title"],
+                "description": course["description"],
+            }
+            for field, text in fields.items():
+                for token in tokenize(text):
+                    weights = self.postings[token]
+                    weights[course_id] = weights.get(course_id, 0.0) + FIELD_WEIGHTS[field]
+            for skill in course["skills"]:
+                self.exact_skills[" ".join(tokenize(skill))].add(course_id)
+        total = len(courses) or 1
+        self.idf = {token: math.log(1 + total / len(weights)) for token, weights in self.postings.items()}
+
+    # Ranked courses for one skill. Courses listing the skill verbatim come first, and
+    # weak partial matches (under a quarter of the best score) are dropped.
+    def lookup(self, skill, limit=3):
+        tokens = tokenize(skill)
+        if not tokens:
+            return []
+        scores = defaultdict(float)
+        for token in set(tokens):
+            idf = self.idf.get(token)
+            if idf is None:
+                continue
+            for course_id, weight in self.postings[token].items():
+                scores[course_id] += idf * weight
+        for course_id in self.exact_skills.get(" ".join(tokens), ()):
+            scores[course_id] += 100.0
+        if not scores:
+            return []
+        floor = max(scores.values()) / 4
+        ranked = sorted(((course_id, score) for course_id, score in scores.items() if score >= floor),
+                        key=lambda item: (-item[1], item[0]))[:limit]
+        return [dict(self.courses[course_id], score=round(score, 2)) for course_id, score in ranked]
+
+
+def load_index(path=None):
+    return CourseIndex(load_catalog(path or os.getenv("COURSE_CATALOG_PATH", DEFAULT_CATALOG)))
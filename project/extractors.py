@@ -0,0 +1,192 @@
+import mmap
+import os
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+
+import PyPDF2 as pdf
+
+from uploads import UploadRejected, open_pdf_source, upload_limits
+
+# PyMuPDF is the fastest backend but is AGPL-licensed, so it is not in requirements.txt: install it
+# separately (pip install PyMuPDF) where its licence is acceptable, and it is used first
+try:
+    import fitz  # PyMuPDF
+except ImportError:
+    fitz = None
+
+try:
+    import pypdf
+except ImportError:
+    pypdf = None
+
+try:
+    from pdfminer.high_level import extract_pages as pdfminer_extract_pages
+    from pdfminer.layout import LTTextContainer
+    from pdfminer.pdfpage import PDFPage
+except ImportError:
+    pdfminer_extract_pages = None
+
+# Alphanumeric characters per page at which a page counts as fully extracted
+EXPECTED_CHARS_PER_PAGE = 400
+DEFAULT_ORDER = "pymupdf,pypdf2,pypdf,pdfminer"
+
+
+class ExtractionResult(namedtuple("ExtractionResult", ["pages", "backend", "page_count", "quality", "seconds"])):
+    __slots__ = ()
+
+    @property
+    def text(self):
+        return "".join(self.pages)
+
+
+# Base class for PDF text extraction backends. open() is a context manager yielding the page count and
+# a lazy iterator over page texts, so limits can be enforced before extracting and the document is closed
+# however extraction ends.
+class PdfExtractor:
+    name = ""
+
+    def available(self):
+        return True
+
+    def open(self, stream):
+        raise NotImplementedError
+
+
+class PyPDF2Extractor(PdfExtractor):
+    name = "pypdf2"
+
+    @contextmanager
+    def open(self, stream):
+        reader = pdf.PdfReader(stream)
+        yield len(reader.pages), (page.extract_text() or "" for page in reader.pages)
+
+
+class PypdfExtractor(PdfExtractor):
+    name = "pypdf"
+
+    def available(self):
+        return pypdf is not None
+
+    @contextmanager
+    def open(self, stream):
+        reader = pypdf.PdfReader(stream)
+        yield len(reader.pages), (page.extract_text() or "" for page in reader.pages)
+
+
+class PyMuPDFExtractor(PdfExtractor):
+    name = "pymupdf"
+
+    def available(self):
+        return fitz is not None
+
+    # Uploads on disk are parsed straight from their memory map; in-memory spools (at most UPLOAD_SPOOL_KB)
+    # are read into bytes, as the spooled file does not expose its buffer
+    @contextmanager
+    def open(self, stream):
+        buffer = memoryview(stream) if isinstance(stream, mmap.mmap) else stream.read()
+        try:
+            doc = fitz.open(stream=buffer, filetype="pdf")
+            try:
+                yield doc.page_count, (page.get_text() for page in doc)
+            finally:
+                doc.close()
+        finally:
+            if isinstance(buffer, memoryview):
+                buffer.release()
+
+
+class PdfminerExtractor(PdfExtractor):
+    name = "pdfminer"
+
+    def available(self):
+        return pdfminer_extract_pages is not None
+
+    @contextmanager
+    def open(self, stream):
+        page_count = sum(1 for _ in PDFPage.get_pages(stream))
+        stream.seek(0)
+        yield page_count, ("".join(el.get_text() for el in layout if isinstance(el, LTTextContainer))
+                           for layout in pdfminer_extract_pages(stream))
+
+
+EXTRACTORS = {extractor.name: extractor for extractor in (
+    PyMuPDFExtractor(), PyPDF2Extractor(), PypdfExtractor(), PdfminerExtractor()
+)}
+
+
+# Backends in the order the auto strategy tries them, fastest first
+def extractor_order():
+    names = [name.strip() for name in os.getenv("PDF_EXTRACTORS", DEFAULT_ORDER).split(",")]
+    return [EXTRACTORS[name] for name in names if name in EXTRACTORS and EXTRACTORS[name].available()]
+
+
+# Score how much usable text came out of a document, from 0 (nothing) to 1 (a full page of text per page).
+# Pages full of replacement characters or symbols score low even when they are long.
+def text_yield(pages, page_count):
+    if not page_count:
+        return 0.0
+    text = "".join(pages)
+    if not text.strip():
+        return 0.0
+    alnum = sum(ch.isalnum() for ch in text)
+    readable = alnum + sum(ch.isspace() for ch in text)
+    density = min(1.0, alnum / (page_count * EXPECTED_CHARS_PER_PAGE))
+    return round(density * readable / len(text), 3)
+
+
+# Run one backend over an open stream within the page and character limits
+def run_extractor(extractor, stream, limits):
+    started = time.perf_counter()
+    stream.seek(0)
+    with extractor.open(stream) as (page_count, page_iter):
+        if page_count > limits["max_pages"]:
+            raise UploadRejected(
+                f"The PDF has {page_count} pages; at most {limits['max_pages']} pages are supported."
+            )
+        pages = []
+        total_chars = 0
+        for page_text in page_iter:
+            total_chars += len(page_text)
+            if total_chars > limits["max_chars"]:
+                raise UploadRejected(
+                    f"The PDF contains more than {limits['max_chars']:,} characters of text. "
+                    "Please upload a shorter document."
+                )
+            pages.append(page_text)
+    return ExtractionResult(pages, extractor.name, page_count, text_yield(pages, page_count),
+                            time.perf_counter() - started)
+
+
+# Extract a document with the given strategy: "auto" tries the backends fastest first and
+# only falls back to the next one while the text yield stays under PDF_MIN_TEXT_YIELD
+def extract_document(source, limits=None, strategy=None):
+    limits = limits or upload_limits()
+    strategy = strategy or os.getenv("PDF_EXTRACTOR_STRATEGY", "auto")
+    min_yield = float(os.getenv("PDF_MIN_TEXT_YIELD", "0.2"))
+    if strategy == "auto":
+        candidates = extractor_order()
+    elif strategy in EXTRACTORS and EXTRACTORS[strategy].available():
+        candidates = [EXTRACTORS[strategy]]
+    else:
+        raise ValueError(f"Unknown or unavailable PDF extractor: {strategy}")
+
+    best = None
+    errors = []
+    with open_pdf_source(source, limits) as stream:
+        for extractor in candidates:
+            try:
+                result = run_extractor(extractor, stream, limits)
+            except UploadRejected:
+                raise
+            except Exception as e:
+                errors.append(f"{extractor.name}: {e}")
+                continue
+            if best is None or result.quality > best.quality:
+                best = result
+            if result.quality >= min_yield:
+                break
+    if best is None:
+        raise ValueError("; ".join(errors) or "No PDF extractor is available")
+    return best
+
@@ -0,0 +1,38 @@
+import importlib
+import os
+from collections import namedtuple
+
+# A selectable feature: its value, its label in the feature menu, and the module and function that
+# render it. The module is imported only when the feature is selected.
+Feature = namedtuple("Feature", ["value", "label", "module", "function"])
+
+FEATURES = {}
+
+
+def register(feature):
+    FEATURES[feature.value] = feature
+    return feature
+
+
+# Import the feature's module on first use and return its render function
+def load_feature(value):
+    feature = FEATURES[value]
+    return getattr(importlib.import_module(f"{__name__}.{feature.module}"), feature.function)
+
+
+register(Feature("ats-resume", "ATS Check - Resume Only", "ats_resume", "ats_check_resume_only"))
+register(Feature("ats-resume-jd", "ATS Check - Resume with Job Description", "ats_resume_jd", "ats_check_with_jd"))
+register(Feature("real-time-suggestions", "Real-time Content Suggestions", "real_time_suggestions",
+                 "real_time_suggestions"))
+register(Feature("generate-resume", "Generate Resume/Cover Letter", "generate_resume",
+                 "generate_resume_cover_letter"))
+register(Feature("analyze-jd", "Job Description Analysis", "analyze_jd", "analyze_job_description"))
+register(Feature("company-info", "Company Information for Interview Prep", "company_info", "get_company_info"))
+register(Feature("linkedin-optimization", "AI-Powered LinkedIn Optimization", "linkedin", "linkedin_optimization"))
+register(Feature("interview-preparation", "Interview Preparation", "interview_preparation",
+                 "interview_preparation"))
+register(Feature("skill-gap-analysis", "Skill Gap Analysis and Courses Recommendation", "skill_gap",
+                 "skill_gap_analysis"))
+# Searches every user's analysed documents, so only offered on admin deployments
+if os.getenv("APP_ADMIN") == "1":
+    register(Feature("keyword-search", "Keyword Search", "keyword_search", "keyword_search"))
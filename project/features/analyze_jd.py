@@ -0,0 +1,45 @@
+import json
+
+import streamlit as st
+
+from app_helpers import (add_download_button, get_gemini_response, index_keywords, parse_ai_response,
+                         passes_preflight, result_panel, store_result)
+from prompts import render_prompt
+
+
+# Render the analysis of a job description
+def render_jd_analysis(result):
+    st.subheader("Job Description Analysis Results")
+    st.subheader("Essential Skills")
+    for skill in result['Essential_Skills']:
+        st.write(f"- {skill}")
+    st.subheader("Key Qualifications")
+    for qual in result['Key_Qualifications']:
+        st.write(f"- {qual}")
+    st.subheader("Main Responsibilities")
+    for resp in result['Main_Responsibilities']:
+        st.write(f"- {resp}")
+    st.subheader("Company Culture Indicators")
+    for indicator in result['Company_Culture']:
+        st.write(f"- {indicator}")
+    st.subheader("Potential Resume Keywords")
+    st.write(", ".join(result['Resume_Keywords']))
+
+    # Add download button
+    add_download_button(json.dumps(result, indent=2), "job_description_analysis")
+
+
+# Function to Analyze Job Description
+def analyze_job_description():
+    st.subheader("Job Description Analysis")
+    jd = st.text_area("Enter the job description:")
+    if st.button("Analyze", key="analyze_job_description") and passes_preflight("analyze-jd", jd=jd):
+        prompt = render_prompt("analyze_jd", jd=jd)
+        response = get_gemini_response(prompt)
+        parsed_response = parse_ai_response(response)
+        if parsed_response:
+            index_keywords("jd", jd, requires=parsed_response['Essential_Skills'] + parsed_response['Resume_Keywords'])
+            store_result("analyze-jd", parsed_response, inputs=(jd,))
+        else:
+            st.error("Failed to parse the AI response. Please try again.")
+    result_panel("analyze-jd", render_jd_analysis, inputs=(jd,))
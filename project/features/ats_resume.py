@@ -0,0 +1,48 @@
+import json
+
+import streamlit as st
+
+from app_helpers import (add_download_button, analyze_resume_version, index_keywords, input_pdf_text,
+                         passes_preflight, result_panel, show_strength_chart, show_version_score, store_result)
+
+
+# Render the ATS analysis of a resume
+def render_ats_result(result, text, previous, rescored):
+    st.subheader("ATS Analysis Results")
+    show_version_score("ATS Score", result['ATS_Score'], 'ATS_Score', previous, rescored)
+    st.subheader("Strengths")
+    for strength in result['Strengths']:
+        st.write(f"- {strength}")
+    st.subheader("Areas for Improvement")
+    for improvement in result['Improvements']:
+        st.write(f"- {improvement}")
+    st.subheader("Key Keywords Detected")
+    st.write(", ".join(result['Keywords']))
+    st.subheader("Formatting Assessment")
+    st.write(result['Formatting'])
+    show_strength_chart(text)
+
+    # Add download button
+    add_download_button(json.dumps(result, indent=2), "ats_analysis_results")
+
+
+# Function for ATS Check - Resume Only
+def ats_check_resume_only():
+    st.subheader("ATS Check - Resume Only")
+    uploaded_file = st.file_uploader("Upload Your Resume", type="pdf", key="resume_only")
+    if uploaded_file is not None:
+        text = input_pdf_text(uploaded_file)
+        if text:
+            if st.button("Analyze Resume", key="analyze_resume_only") and passes_preflight("ats-resume", resume=text):
+                parsed_response, previous, rescored = analyze_resume_version("ats_resume", text)
+                if parsed_response:
+                    index_keywords("candidate", text, has=parsed_response['Keywords'])
+                    store_result("ats-resume", parsed_response, inputs=(text,), text=text, previous=previous,
+                                 rescored=rescored)
+                else:
+                    st.error("Failed to parse the AI response. Please try again.")
+            result_panel("ats-resume", render_ats_result, inputs=(text,))
+        else:
+            st.error("Failed to read the uploaded resume. Please try again.")
+    else:
+        st.info("Please upload a resume to proceed.")
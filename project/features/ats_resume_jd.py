@@ -0,0 +1,55 @@
+import json
+
+import streamlit as st
+
+from app_helpers import (add_download_button, analyze_resume_version, index_keywords, index_match, input_pdf_text,
+                         passes_preflight, result_panel, show_strength_chart, show_version_score, store_result)
+
+
+# Render the ATS compatibility analysis of a resume against a job description
+def render_ats_jd_result(result, resume_text, jd_text, previous, rescored):
+    st.subheader("ATS Compatibility Analysis")
+    show_version_score("ATS Compatibility Score", result['ATS_Compatibility_Score'],
+                       'ATS_Compatibility_Score', previous, rescored)
+    st.subheader("Matched Keywords")
+    st.write(", ".join(result['Matched_Keywords']))
+    st.subheader("Missing Keywords")
+    st.write(", ".join(result['Missing_Keywords']))
+    st.subheader("Suggestions for Improvement")
+    for suggestion in result['Improvement_Suggestions']:
+        st.write(f"- {suggestion}")
+    st.subheader("Overall Assessment")
+    st.write(result['Overall_Assessment'])
+    show_strength_chart(resume_text, jd_text)
+
+    # Add download button
+    add_download_button(json.dumps(result, indent=2), "ats_compatibility_analysis")
+
+
+# Updated Function for ATS Check with Job Description
+def ats_check_with_jd():
+    st.subheader("ATS Check - Resume with Job Description")
+    uploaded_resume = st.file_uploader("Upload Your Resume", type="pdf", key="resume_with_jd")
+    jd_text = st.text_area("Paste the Job Description here:", height=300)
+
+    if uploaded_resume is not None and jd_text:
+        resume_text = input_pdf_text(uploaded_resume)
+        if resume_text:
+            if (st.button("Generate Analysis", key="generate_analysis")
+                    and passes_preflight("ats-resume-jd", resume=resume_text, jd=jd_text)):
+                parsed_response, previous, rescored = analyze_resume_version("ats_resume_jd", resume_text, jd_text)
+                if parsed_response:
+                    required = parsed_response['Matched_Keywords'] + parsed_response['Missing_Keywords']
+                    index_keywords("candidate", resume_text, has=parsed_response['Matched_Keywords'])
+                    index_keywords("jd", jd_text, requires=required)
+                    index_match(resume_text, jd_text, parsed_response['Matched_Keywords'],
+                                parsed_response['Missing_Keywords'], required)
+                    store_result("ats-resume-jd", parsed_response, inputs=(resume_text, jd_text),
+                                 resume_text=resume_text, jd_text=jd_text, previous=previous, rescored=rescored)
+                else:
+                    st.error("Failed to parse the AI response. Please try again.")
+            result_panel("ats-resume-jd", render_ats_jd_result, inputs=(resume_text, jd_text))
+        else:
+            st.error("Failed to read the uploaded resume. Please try again.")
+    else:
+        st.info("Please upload a resume and paste the job description to proceed.")
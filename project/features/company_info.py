@@ -0,0 +1,43 @@
+from datetime import datetime
+
+import streamlit as st
+
+from app_helpers import add_download_button, get_company_cache, get_gemini_generation, result_panel, store_result
+from company_cache import normalize_company_name
+from prompts import render_prompt
+
+
+# Render a company profile, noting when it came from the shared cache
+def render_company_info(result, company_name, created_at):
+    st.subheader(f"Information about {company_name}")
+    if created_at:
+        st.caption(f"Cached profile from {datetime.fromtimestamp(created_at):%Y-%m-%d}")
+    st.write(result)
+
+    # Add download button
+    add_download_button(result, f"{company_name}_info")
+
+
+# Function to get company information (excluding recent news and achievements)
+def get_company_info():
+    st.subheader("Company Information for Interview Preparation")
+    company_name = st.text_input("Enter the name of the company:")
+    inputs = (normalize_company_name(company_name),)
+    if st.button("Get Company Info", key="get_company_info"):
+        if not inputs[0]:
+            st.warning("Please enter the name of a company.")
+            return
+        company_cache = get_company_cache()
+        cached = company_cache.get(company_name)
+        if cached:
+            response, created_at = cached
+        else:
+            prompt = render_prompt("company_info", company=company_name)
+            generation = get_gemini_generation(prompt)
+            response = generation.text
+            # A profile cut off at the output cap is shown but not shared for the next 30 days
+            if not generation.truncated:
+                company_cache.set(company_name, response)
+            created_at = None
+        store_result("company-info", response, inputs=inputs, company_name=company_name, created_at=created_at)
+    result_panel("company-info", render_company_info, inputs=inputs)
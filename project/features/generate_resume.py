@@ -0,0 +1,32 @@
+import streamlit as st
+
+from app_helpers import (add_download_button, get_gemini_response, input_pdf_text, passes_preflight, result_panel,
+                         store_result)
+from prompts import render_prompt
+
+
+# Render a generated resume or cover letter
+def render_generated_content(result):
+    st.subheader("Generated Content")
+    st.write(result)
+
+    # Add download button
+    add_download_button(result, "generated_resume_cover_letter")
+
+
+# Function to Generate Resume/Cover Letter
+def generate_resume_cover_letter():
+    st.subheader("Generate Resume/Cover Letter")
+
+    uploaded_resume = st.file_uploader("Upload Your Current Resume (Optional)", type="pdf", key="current_resume")
+    jd = st.text_area("Enter the job description:", height=300)
+    inputs = (getattr(uploaded_resume, "file_id", None), jd)
+
+    if st.button("Generate", key="generate_resume_cover_letter"):
+        resume_text = ""
+        if uploaded_resume is not None:
+            resume_text = input_pdf_text(uploaded_resume)
+        if passes_preflight("generate-resume", resume=resume_text or None, jd=jd):
+            prompt = render_prompt("generate_resume", resume=resume_text, jd=jd)
+            store_result("generate-resume", get_gemini_response(prompt), inputs=inputs)
+    result_panel("generate-resume", render_generated_content, inputs=inputs)
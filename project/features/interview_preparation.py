@@ -0,0 +1,133 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import streamlit as st
+
+from app_helpers import (add_download_button, get_gemini_response, input_pdf_text, parse_ai_response, passes_preflight,
+                         result_panel, resume_context, store_result)
+from llm import generate_text
+from prompts import render_prompt
+
+# Resume sections the interview prompts need: what the candidate has done and can talk about
+SECTIONS = ("Summary", "Experience", "Projects")
+STAR_PARTS = ("Situation", "Task", "Action", "Result")
+
+
+# Whether a generated answer has the shape render_interview_answer needs: a STAR answer with all four parts
+# and a list of tips
+def is_complete_answer(qa):
+    return (isinstance(qa, dict) and isinstance(qa.get('STAR_Answer'), dict)
+            and all(part in qa['STAR_Answer'] for part in STAR_PARTS)
+            and isinstance(qa.get('Additional_Tips'), list))
+
+
+# Render the STAR answer and tips for one interview question
+def render_interview_answer(qa):
+    st.markdown("#### Suggested STAR Answer:")
+    for part in STAR_PARTS:
+        st.markdown(f"**{part}:** {qa['STAR_Answer'][part]}")
+    st.markdown("#### Additional Tips:")
+    for tip in qa['Additional_Tips']:
+        st.markdown(f"- {tip}")
+
+
+# Render the full interview guide: every question with its answer, or a note where none was generated
+def render_interview_guide(result):
+    st.subheader("Interview Preparation Guide")
+    for i, qa in enumerate(result, 1):
+        st.markdown(f"### Question {i}: {qa['Question']}")
+        if is_complete_answer(qa):
+            render_interview_answer(qa)
+        else:
+            st.warning("No suggested answer was generated for this question.")
+        st.markdown("---")
+
+    # Add download button
+    add_download_button(json.dumps({"Interview_Questions": result}, indent=2), "interview_preparation_guide")
+
+
+# Generate STAR answers for a batch of questions. Runs in a worker thread, so no Streamlit calls here
+# and the session's API key is passed in.
+def generate_interview_answers(resume_text, jd_text, questions, api_key):
+    numbered = "\n".join(f"{i}. {question}" for i, question in enumerate(questions, 1))
+    return generate_text(render_prompt("interview_answers", resume=resume_text, jd=jd_text, questions=numbered),
+                         api_key=api_key)
+
+
+# Updated function for Interview Preparation. The question list is generated first and shown straight away,
+# then the STAR answers are generated in parallel batches and filled in as each batch finishes.
+def interview_preparation():
+    st.subheader("Interview Preparation")
+
+    uploaded_resume = st.file_uploader("Upload Your Resume", type="pdf", key="interview_prep_resume")
+    jd_text = st.text_area("Paste the Job Description here:", height=300)
+
+    if uploaded_resume is not None and jd_text:
+        resume_text = input_pdf_text(uploaded_resume)
+        if resume_text:
+            inputs = (resume_text, jd_text)
+            if (st.button("Generate Interview Questions and Suggestions", key="generate_interview_prep")
+                    and passes_preflight("interview-preparation", resume=resume_text, jd=jd_text)):
+                resume_text = resume_context(resume_text, SECTIONS)
+                prompt = render_prompt("interview_questions", resume=resume_text, jd=jd_text)
+                response = get_gemini_response(prompt)
+                parsed_response = parse_ai_response(response)
+
+                if parsed_response and parsed_response.get('Interview_Questions'):
+                    questions = [str(q) for q in parsed_response['Interview_Questions']]
+                    # Answers stream in here while they are generated, then the stored guide replaces them
+                    live = st.empty()
+                    with live.container():
+                        st.subheader("Interview Preparation Guide")
+                        placeholders = []
+                        for i, question in enumerate(questions, 1):
+                            st.markdown(f"### Question {i}: {question}")
+                            placeholder = st.empty()
+                            placeholder.info("Preparing a suggested answer...")
+                            placeholders.append(placeholder)
+                            st.markdown("---")
+
+                        batch_size = max(1, int(os.getenv("INTERVIEW_BATCH_SIZE", "2")))
+                        workers = max(1, int(os.getenv("INTERVIEW_WORKERS", "5")))
+                        api_key = st.session_state.get("api_key") or None
+                        results = [{"Question": q, "STAR_Answer": None, "Additional_Tips": []} for q in questions]
+                        failures = []
+                        with ThreadPoolExecutor(max_workers=workers) as executor:
+                            futures = {
+                                executor.submit(generate_interview_answers, resume_text, jd_text,
+                                                questions[start:start + batch_size], api_key): start
+                                for start in range(0, len(questions), batch_size)
+                            }
+                            for future in as_completed(futures):
+                                start = futures[future]
+                                end = min(start + batch_size, len(questions))
+                                try:
+                                    answers = parse_ai_response(future.result()) or {}
+                                    answers = answers.get('Interview_Questions', [])
+                                    if not isinstance(answers, list):
+                                        answers = []
+                                except Exception as e:
+                                    answers = []
+                                    failures.append(f"Could not generate answers for questions {start + 1}-{end}: "
+                                                    f"{str(e)}")
+                                for offset, index in enumerate(range(start, end)):
+                                    if offset < len(answers) and is_complete_answer(answers[offset]):
+                                        qa = dict(answers[offset], Question=questions[index])
+                                        results[index] = qa
+                                        with placeholders[index].container():
+                                            render_interview_answer(qa)
+                                    else:
+                                        placeholders[index].warning("No suggested answer was generated "
+                                                                    "for this question.")
+                    live.empty()
+                    for failure in failures:
+                        st.warning(failure)
+                    store_result("interview-preparation", results, inputs=inputs)
+                else:
+                    st.error("Failed to parse the AI response. Please try again.")
+            result_panel("interview-preparation", render_interview_guide, inputs=inputs)
+        else:
+            st.error("Failed to read the uploaded resume. Please try again.")
+    else:
+        st.info("Please upload your resume and paste the job description to proceed.")
@@ -0,0 +1,36 @@
+import time
+
+import streamlit as st
+
+from app_helpers import get_keyword_index
+from keyword_index import FIELDS, QueryError
+
+KINDS = {"All documents": None, "Candidates": "candidate", "Job descriptions": "jd",
+         "Candidate-JD matches": "match"}
+
+
+# Boolean search over the keywords of every resume and job description analysed so far, without a model call.
+# It covers every user's documents, so it is only in the feature menu of admin deployments (APP_ADMIN=1).
+def keyword_search():
+    st.subheader("Keyword Search")
+    index = get_keyword_index()
+    stats = index.stats()
+    st.caption(f"{stats['documents']:,} analysed document(s), {stats['keywords']:,} distinct keywords. "
+               f"Fields: {', '.join(FIELDS)}; unprefixed keywords match has and requires.")
+    query = st.text_input("Query", placeholder='kubernetes AND go AND missing:terraform')
+    kind = st.selectbox("Search in", list(KINDS))
+    if query:
+        try:
+            started = time.perf_counter()
+            total = index.count(query, KINDS[kind])
+            matches = index.query(query, KINDS[kind], limit=200)
+        except QueryError as e:
+            st.error(f"Invalid query: {e}")
+            return
+        st.write(f"{total:,} match(es) in {(time.perf_counter() - started) * 1000:.1f} ms")
+        for doc_id in matches:
+            terms = index.document_terms(doc_id) or {}
+            with st.expander(doc_id):
+                for field in FIELDS:
+                    if terms.get(field):
+                        st.write(f"**{field}:** {', '.join(terms[field])}")
@@ -0,0 +1,62 @@
+import json
+
+import streamlit as st
+
+from app_helpers import (add_download_button, get_gemini_response, input_pdf_text, parse_ai_response,
+                         passes_preflight, result_panel, store_result)
+from prompts import render_prompt
+
+
+# Render the analysis of a LinkedIn profile
+def render_linkedin_result(result):
+    st.subheader("LinkedIn Profile Analysis Results")
+    st.metric("Profile Strength", f"{result['Profile_Strength']}/100")
+
+    st.subheader("Strengths")
+    for strength in result['Strengths']:
+        st.write(f"- {strength}")
+
+    st.subheader("Areas for Improvement")
+    for improvement in result['Improvements']:
+        st.write(f"- {improvement}")
+
+    st.subheader("Visibility Enhancement Suggestions")
+    for suggestion in result['Visibility_Suggestions']:
+        st.write(f"- {suggestion}")
+
+    st.subheader("Keyword Optimization Recommendations")
+    st.write(", ".join(result['Keyword_Recommendations']))
+
+    st.subheader("Content Ideas for Posts or Articles")
+    for idea in result['Content_Ideas']:
+        st.write(f"- {idea}")
+
+    # Add download button
+    add_download_button(json.dumps(result, indent=2), "linkedin_profile_analysis")
+
+
+# Updated function for LinkedIn Optimization
+def linkedin_optimization():
+    st.subheader("AI-Powered LinkedIn Optimization")
+    uploaded_file = st.file_uploader("Upload Your LinkedIn Profile PDF", type="pdf", key="linkedin_profile")
+
+    if uploaded_file is not None:
+        profile_text = input_pdf_text(uploaded_file)
+        if profile_text:
+            if (st.button("Analyze LinkedIn Profile", key="analyze_linkedin")
+                    and passes_preflight("linkedin-optimization", resume=profile_text,
+                                         resume_label="LinkedIn profile")):
+                prompt = render_prompt("linkedin", profile=profile_text)
+                with st.spinner("Analyzing your LinkedIn profile..."):
+                    response = get_gemini_response(prompt)
+                    parsed_response = parse_ai_response(response)
+
+                if parsed_response:
+                    store_result("linkedin-optimization", parsed_response, inputs=(profile_text,))
+                else:
+                    st.error("Failed to parse the AI response. Please try again.")
+            result_panel("linkedin-optimization", render_linkedin_result, inputs=(profile_text,))
+        else:
+            st.error("Failed to read the uploaded LinkedIn profile PDF. Please try again.")
+    else:
+        st.info("Please upload your LinkedIn profile PDF to proceed.")
@@ -0,0 +1,124 @@
+import os
+import time
+
+import streamlit as st
+
+from app_helpers import add_download_button, get_gemini_response, parse_ai_response, result_panel, store_result
+from live_suggestions import diff_paragraphs, format_pending, store_suggestions
+from prompts import render_prompt
+
+
+MAX_ATTEMPTS = int(os.getenv("LIVE_MAX_ATTEMPTS", "3"))
+
+
+# Analysis failures by paragraph hash: attempts so far and when the next attempt is allowed. Paragraphs
+# that were edited away are forgotten; an edited paragraph has a new hash and starts over.
+def _failures(paragraphs):
+    failures = st.session_state.setdefault("live_failures", {})
+    current = {key for _paragraph, key, _suggestions in paragraphs}
+    for key in [key for key in failures if key not in current]:
+        del failures[key]
+    return failures
+
+
+# Paragraphs still to be analysed that have attempts left, and those of them whose backoff has passed
+def _outstanding(paragraphs, failures, now):
+    waiting = [(paragraph, key) for paragraph, key, suggestions in paragraphs
+               if suggestions is None and failures.get(key, (0, 0.0))[0] < MAX_ATTEMPTS]
+    due = [(paragraph, key) for paragraph, key in waiting if now >= failures.get(key, (0, 0.0))[1]]
+    return waiting, due
+
+
+def live_needs_polling():
+    paragraphs = diff_paragraphs(st.session_state.get("live_content", ""))
+    waiting, _due = _outstanding(paragraphs, _failures(paragraphs), time.monotonic())
+    return bool(waiting)
+
+
+# Live suggestions. Re-analyses only the paragraphs whose hash is not in the cache. st.text_area sends its
+# value on blur or Ctrl+Enter, not per keystroke, so each committed edit is analysed as it arrives; there
+# is nothing to debounce. A failed analysis is retried with exponential backoff from LIVE_RETRY_SECONDS,
+# at most LIVE_MAX_ATTEMPTS times. Returns whether anything is still waiting to be analysed.
+def render_live_suggestions():
+    content = st.session_state.get("live_content", "")
+    paragraphs = diff_paragraphs(content)
+    failures = _failures(paragraphs)
+    now = time.monotonic()
+    _waiting, due = _outstanding(paragraphs, failures, now)
+    analysed = 0
+    if due:
+        # Count the attempt before the call, so a call that stops the run still backs off
+        for _paragraph, key in due:
+            attempts = failures.get(key, (0, 0.0))[0] + 1
+            failures[key] = (attempts, now + float(os.getenv("LIVE_RETRY_SECONDS", "5")) * 2 ** (attempts - 1))
+        prompt = render_prompt("paragraph_suggestions", paragraphs=format_pending(due))
+        parsed = parse_ai_response(get_gemini_response(prompt))
+        stored = store_suggestions(due, parsed)
+        for key in stored:
+            failures.pop(key, None)
+        analysed = len(stored)
+        paragraphs = diff_paragraphs(content)
+
+    waiting, _due = _outstanding(paragraphs, failures, time.monotonic())
+    if not paragraphs:
+        st.info("Start typing to get suggestions for each paragraph.")
+        return bool(waiting)
+    pending = sum(1 for _paragraph, _key, suggestions in paragraphs if suggestions is None)
+    st.caption(f"{len(paragraphs)} paragraph(s), {analysed} re-analysed, "
+               f"{len(paragraphs) - pending - analysed} reused from earlier revisions")
+    if pending > len(waiting):
+        st.warning(f"{pending - len(waiting)} paragraph(s) could not be analysed. Edit them to try again.")
+    report = []
+    for number, (paragraph, _key, suggestions) in enumerate(paragraphs, 1):
+        preview = paragraph if len(paragraph) <= 80 else paragraph[:77] + "..."
+        with st.expander(f"Paragraph {number}: {preview}", expanded=bool(suggestions)):
+            if suggestions is None:
+                st.write("Pending analysis.")
+            elif suggestions:
+                for suggestion in suggestions:
+                    st.write(f"- {suggestion}")
+            else:
+                st.write("No changes suggested.")
+        report.append(f"Paragraph {number}:\n{paragraph}\n" +
+                      "".join(f"- {suggestion}\n" for suggestion in suggestions or []))
+
+    # Add download button
+    add_download_button("\n".join(report), "content_suggestions")
+    return bool(waiting)
+
+
+# Live suggestions panel that polls every LIVE_POLL_SECONDS while paragraphs are waiting for analysis.
+# Once none are, the page reruns once and shows the panel without polling.
+@st.fragment(run_every=float(os.getenv("LIVE_POLL_SECONDS", "1")))
+def live_suggestions_panel():
+    if not render_live_suggestions():
+        st.rerun()
+
+
+# Render the suggestions for a whole resume or cover letter
+def render_content_suggestions(result):
+    st.subheader("Improvement Suggestions")
+    st.write(result)
+
+    # Add download button
+    add_download_button(result, "content_suggestions")
+
+
+# Function for Real-time Content Suggestions
+def real_time_suggestions():
+    st.subheader("Real-time Content Suggestions")
+    live_mode = st.toggle("Live mode", key="live_mode",
+                          help="Re-analyse only the paragraphs you change, when you click away or press Ctrl+Enter.")
+    if live_mode:
+        st.text_area("Enter your resume or cover letter content:", height=300, key="live_content")
+        if live_needs_polling():
+            live_suggestions_panel()
+        else:
+            render_live_suggestions()
+        return
+
+    content = st.text_area("Enter your resume or cover letter content:")
+    if st.button("Get Suggestions", key="get_suggestions"):
+        prompt = render_prompt("content_suggestions", content=content)
+        store_result("real-time-suggestions", get_gemini_response(prompt), inputs=(content,))
+    result_panel("real-time-suggestions", render_content_suggestions, inputs=(content,))
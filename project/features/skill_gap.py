@@ -0,0 +1,81 @@
+import json
+
+import streamlit as st
+
+from app_helpers import (add_download_button, get_course_index, get_gemini_response, index_keywords, index_match,
+                         input_pdf_text, parse_ai_response, passes_preflight, resume_context, result_panel,
+                         store_result)
+from prompts import render_prompt
+
+# Resume sections the skill gap prompt needs; skills also show up in experience, projects and certifications
+SECTIONS = ("Summary", "Skills", "Experience", "Projects", "Certifications")
+
+
+# Render the skill gap analysis with the catalogue courses for each gap
+def render_skill_gap_result(result):
+    st.subheader("Skill Gap Analysis Results")
+
+    st.markdown("### Skills in Your Resume")
+    for skill in result['Skills_in_Resume']:
+        st.write(f"- {skill}")
+
+    st.markdown("### Skills Required for the Job")
+    for skill in result['Skills_Required']:
+        st.write(f"- {skill}")
+
+    st.markdown("### Skill Gaps and Course Recommendations")
+    for gap in result['Skill_Gaps']:
+        st.markdown(f"**{gap['Skill']}**")
+        if gap['Course_Recommendations']:
+            for course in gap['Course_Recommendations']:
+                st.markdown(f"Recommended Course: {course['Course_Name']}")
+                st.markdown(f"Available at: {course['Provider']}")
+        else:
+            st.markdown("No matching course in the catalogue yet.")
+        st.markdown("---")
+
+    # Add download button
+    add_download_button(json.dumps(result, indent=2), "skill_gap_analysis")
+
+
+# New function for Skill Gap Analysis and Courses Recommendation
+def skill_gap_analysis():
+    st.subheader("Skill Gap Analysis and Courses Recommendation")
+
+    uploaded_resume = st.file_uploader("Upload Your Resume", type="pdf", key="skill_gap_resume")
+    jd_text = st.text_area("Paste the Job Description here:", height=300)
+
+    if uploaded_resume is not None and jd_text:
+        resume_text = input_pdf_text(uploaded_resume)
+        if resume_text:
+            if (st.button("Analyze Skill Gap and Recommend Courses", key="analyze_skill_gap")
+                    and passes_preflight("skill-gap-analysis", resume=resume_text, jd=jd_text)):
+                prompt = render_prompt("skill_gap", resume=resume_context(resume_text, SECTIONS), jd=jd_text)
+                response = get_gemini_response(prompt)
+                parsed_response = parse_ai_response(response)
+
+                if parsed_response:
+                    course_index = get_course_index()
+                    skill_gaps = []
+                    for skill in parsed_response['Skill_Gaps']:
+                        skill = skill['Skill'] if isinstance(skill, dict) else str(skill)
+                        skill_gaps.append({
+                            "Skill": skill,
+                            "Course_Recommendations": [
+                                {"Course_Name": course['title'], "Provider": course['provider']}
+                                for course in course_index.lookup(skill)
+                            ],
+                        })
+                    parsed_response['Skill_Gaps'] = skill_gaps
+                    index_keywords("candidate", resume_text, has=parsed_response['Skills_in_Resume'])
+                    index_keywords("jd", jd_text, requires=parsed_response['Skills_Required'])
+                    index_match(resume_text, jd_text, parsed_response['Skills_in_Resume'],
+                                [gap["Skill"] for gap in skill_gaps], parsed_response['Skills_Required'])
+                    store_result("skill-gap-analysis", parsed_response, inputs=(resume_text, jd_text))
+                else:
+                    st.error("Failed to parse the AI response. Please try again.")
+            result_panel("skill-gap-analysis", render_skill_gap_result, inputs=(resume_text, jd_text))
+        else:
+            st.error("Failed to read the uploaded resume. Please try again.")
+    else:
+        st.info("Please upload your resume and paste the job description to proceed.")
@@ -0,0 +1,50 @@
+import json
+import os
+
+DEFAULT_PROFILES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "generation_profiles.json")
+CONFIG_KEYS = ("temperature", "top_p", "top_k", "max_output_tokens", "stop_sequences")
+
+
+def load_profiles(path=None):
+    with open(path or os.getenv("GENERATION_PROFILES_PATH", DEFAULT_PROFILES_PATH), encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+# Generation settings for a feature: its named profile from generation_profiles.json with the
+# feature's own overrides on top. Features without an entry use the default profile.
+def generation_config(feature, profiles):
+    entry = profiles.get("features", {}).get(feature, {})
+    config = dict(profiles["profiles"][entry.get("profile", profiles["default"])])
+    config.update({key: value for key, value in entry.items() if key in CONFIG_KEYS})
+    if not config.get("stop_sequences"):
+        config.pop("stop_sequences", None)
+    return config
+
+
+# Deterministic features return the same answer for the same prompt, so their answers are worth caching
+def is_deterministic(config):
+    return config.get("temperature") == 0
+
+
+# Per-feature output tokens of logged generations: calls, mean and max output tokens, how many
+# hit the cap, and the tokens saved against a per-feature baseline mean (e.g. an uncapped run)
+def output_token_report(generations, profiles, baseline=None):
+    by_feature = {}
+    for generation in generations:
+        if not generation.cached:
+            by_feature.setdefault(generation.feature, []).append(generation)
+    report = {}
+    for feature, rows in sorted(by_feature.items()):
+        tokens = [row.output_tokens for row in rows]
+        cap = generation_config(feature, profiles).get("max_output_tokens")
+        mean = sum(tokens) / len(tokens)
+        before = (baseline or {}).get(feature)
+        report[feature] = {
+            "calls": len(rows),
+            "mean_tokens": mean,
+            "max_tokens": max(tokens),
+            "cap": cap,
+            "capped": sum(1 for row in rows if row.truncated),
+            "saved_per_call": before - mean if before is not None else None,
+        }
+    return report
@@ -0,0 +1,139 @@
+import hashlib
+import itertools
+import os
+import threading
+import time
+from collections import deque
+
+from resilience import ModelUnavailable
+
+WINDOW_SECONDS = 60
+
+
+def load_keys(value=None, path=None):
+    value = os.getenv("GEMINI_API_KEYS", "") if value is None else value
+    path = os.getenv("GEMINI_API_KEYS_FILE") if path is None else path
+    keys = [key.strip() for key in value.split(",")]
+    if path:
+        with open(path, encoding="utf-8") as handle:
+            keys.extend(line.strip() for line in handle if not line.startswith("#"))
+    return list(dict.fromkeys(key for key in keys if key))
+
+
+# Short, non-secret label for a key, safe to log and show
+def key_label(key):
+    return "key-" + hashlib.sha256(key.encode("utf-8")).hexdigest()[:8]
+
+
+# One API key with its requests and tokens over the last minute, in-flight reservations, and an
+# ejection deadline while the key is being throttled
+class PooledKey:
+    def __init__(self, key, rpm, tpm):
+        self.key = key
+        self.label = key_label(key)
+        self.rpm = rpm
+        self.tpm = tpm
+        self.calls = deque()
+        self.in_flight = 0
+        self.ejected_until = 0.0
+        self.strikes = 0
+
+    def _expire(self, now):
+        while self.calls and now - self.calls[0][0] >= WINDOW_SECONDS:
+            self.calls.popleft()
+
+    def remaining(self, now):
+        self._expire(now)
+        return self.rpm - len(self.calls), self.tpm - sum(tokens for _at, tokens in self.calls)
+
+    def has_budget(self, now, tokens):
+        if now < self.ejected_until:
+            return False
+        requests, token_budget = self.remaining(now)
+        return requests > 0 and (token_budget >= tokens or not self.calls)
+
+
+# A lease on a pooled key for one call; settle it with the tokens actually used
+class KeyLease:
+    def __init__(self, pool, pooled, entry):
+        self.pool = pool
+        self.pooled = pooled
+        self.entry = entry
+
+    @property
+    def key(self):
+        return self.pooled.key
+
+    def release(self, tokens=None):
+        self.pool._release(self, tokens)
+
+
+# API keys shared by every session in the process. Calls are spread round-robin or to the least-loaded
+# key with enough requests-per-minute and tokens-per-minute budget left; throttled keys are ejected for
+# a backoff period that doubles on each repeated throttle.
+class KeyPool:
+    def __init__(self, keys, rpm=None, tpm=None, strategy=None, eject_seconds=None):
+        rpm = rpm or int(os.getenv("KEY_RPM_LIMIT", "60"))
+        tpm = tpm or int(os.getenv("KEY_TPM_LIMIT", "120000"))
+        self.keys = [PooledKey(key, rpm, tpm) for key in keys]
+        self.strategy = strategy or os.getenv("KEY_POOL_STRATEGY", "least-loaded")
+        self.eject_seconds = eject_seconds or float(os.getenv("KEY_EJECT_SECONDS", "30"))
+        self._order = itertools.cycle(range(len(self.keys))) if self.keys else None
+        self._lock = threading.Condition()
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _pick(self, now, tokens):
+        candidates = [pooled for pooled in self.keys if pooled.has_budget(now, tokens)]
+        if not candidates:
+            return None
+        if self.strategy == "round-robin":
+            for _ in range(len(self.keys)):
+                pooled = self.keys[next(self._order)]
+                if pooled in candidates:
+                    return pooled
+        return min(candidates, key=lambda pooled: (pooled.in_flight, len(pooled.calls)))
+
+    # Reserve a key for a call of roughly `tokens` tokens, waiting up to `timeout` seconds for budget
+    def acquire(self, tokens=0, timeout=None):
+        timeout = float(os.getenv("KEY_WAIT_SECONDS", "30")) if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            while True:
+                now = time.monotonic()
+                pooled = self._pick(now, tokens)
+                if pooled is not None:
+                    entry = [now, tokens]
+                    pooled.calls.append(entry)
+                    pooled.in_flight += 1
+                    return KeyLease(self, pooled, entry)
+                if now >= deadline:
+                    raise ModelUnavailable("All API keys are at their rate limits. Please try again in a minute.")
+                self._lock.wait(min(1.0, deadline - now))
+
+    def _release(self, lease, tokens):
+        with self._lock:
+            lease.pooled.in_flight -= 1
+            if tokens is not None:
+                lease.entry[1] = tokens
+                lease.pooled.strikes = 0
+            self._lock.notify_all()
+
+    # Take a throttled key out of rotation; repeated throttles back off exponentially
+    def eject(self, lease):
+        with self._lock:
+            pooled = lease.pooled
+            pooled.in_flight -= 1
+            pooled.strikes += 1
+            pooled.ejected_until = time.monotonic() + self.eject_seconds * 2 ** min(pooled.strikes - 1, 5)
+
+    def snapshot(self):
+        now = time.monotonic()
+        with self._lock:
+            rows = []
+            for pooled in self.keys:
+                requests, tokens = pooled.remaining(now)
+                rows.append({"key": pooled.label, "remaining_rpm": requests, "remaining_tpm": tokens,
+                             "in_flight": pooled.in_flight, "ejected_for": max(0.0, pooled.ejected_until - now)})
+            return rows
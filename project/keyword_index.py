@@ -0,0 +1,341 @@
+import argparse
+import json
+import os
+import random
+import re
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+import numpy as np
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "keyword_index.sqlite3")
+# has: skills a candidate shows; missing: skills a candidate lacks for a JD (on match documents only);
+# requires: skills a JD asks for
+FIELDS = ("has", "missing", "requires")
+# Fields a term without a field prefix matches
+DEFAULT_FIELDS = ("has", "requires")
+QUERY_TOKEN_RE = re.compile(r'\(|\)|\w+:"[^"]*"|"[^"]*"|[^\s()]+')
+OPERATORS = {"AND", "OR", "NOT"}
+
+
+class QueryError(ValueError):
+    pass
+
+
+def normalize_term(term):
+    return " ".join(str(term).casefold().split())
+
+
+# Set bits of a bitmap as document numbers, via NumPy rather than bit-by-bit
+def bit_positions(bitmap):
+    if not bitmap:
+        return np.array([], dtype=np.int64)
+    data = np.frombuffer(bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little"), dtype=np.uint8)
+    return np.flatnonzero(np.unpackbits(data, bitorder="little"))
+
+
+def bitmap_from_positions(numbers):
+    if not len(numbers):
+        return 0
+    bits = np.zeros(max(numbers) + 1, dtype=bool)
+    bits[list(numbers)] = True
+    return int.from_bytes(np.packbits(bits, bitorder="little").tobytes(), "little")
+
+
+def _bitmap_bytes(bitmap):
+    return bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+
+
+# Inverted index from (field, keyword) to the documents listing it, one bitmap (a Python int, bit n for
+# document n) per keyword. Documents are candidates ("candidate:<id>"), job descriptions ("jd:<id>") and
+# analyses of a candidate against a job description ("match:<candidate id>/<jd id>").
+# The bitmaps are persisted in SQLite and kept in memory, so boolean queries are a few big-int operations.
+# Several processes (the app and bulk_jd_analysis --index) can share one file: document numbers are
+# allocated by SQLite and bitmaps merged inside the writing transaction, and every write bumps a change
+# counter that readers compare with their own to know when to reload.
+class KeywordIndex:
+    def __init__(self, path=None):
+        self.path = path or os.getenv("KEYWORD_INDEX_PATH", DEFAULT_PATH)
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS documents (number INTEGER PRIMARY KEY, doc_id TEXT UNIQUE, "
+                         "terms TEXT, updated_at REAL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS postings (field TEXT, term TEXT, bitmap BLOB, "
+                         "PRIMARY KEY (field, term))")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER)")
+            conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('version', 0)")
+            self._load(conn)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _version(conn):
+        return conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[0]
+
+    # Replace the in-memory copy with the database contents
+    def _load(self, conn):
+        self.doc_ids = []
+        self.doc_numbers = {}
+        self.doc_terms = []
+        self.postings = {}
+        self.version = self._version(conn)
+        kinds = defaultdict(list)
+        for number, doc_id, terms in conn.execute("SELECT number, doc_id, terms FROM documents ORDER BY number"):
+            kinds[self._register(doc_id, json.loads(terms), number)].append(number)
+        self.kinds = {kind: bitmap_from_positions(numbers) for kind, numbers in kinds.items()}
+        for field, term, bitmap in conn.execute("SELECT field, term, bitmap FROM postings"):
+            self.postings[(field, term)] = int.from_bytes(bitmap, "little")
+
+    # Reload if another process (or another KeywordIndex on the same file) has written since the last load
+    def refresh(self):
+        with self._lock, self._connect() as conn:
+            if self._version(conn) != self.version:
+                self._load(conn)
+
+    def __len__(self):
+        return len(self.doc_numbers)
+
+    def _register(self, doc_id, terms, number):
+        while len(self.doc_ids) <= number:
+            self.doc_ids.append(None)
+            self.doc_terms.append({})
+        self.doc_ids[number] = doc_id
+        self.doc_terms[number] = terms
+        self.doc_numbers[doc_id] = number
+        return doc_id.split(":", 1)[0]
+
+    # Add or update documents: (doc_id, {field: [keywords]}) pairs. Fields not given keep their keywords;
+    # given fields replace them, or with merge=True are added to them. The whole batch is one write
+    # transaction that reads the stored terms and bitmaps and merges into them, so concurrent writers in
+    # other processes never overwrite each other. Bits are collected per keyword and applied once per batch.
+    def add_many(self, documents, merge=False):
+        with self._lock, self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            stale = self._version(conn) != self.version
+            removed = defaultdict(list)
+            added = defaultdict(list)
+            registered = []
+            for doc_id, fields in documents:
+                row = conn.execute("SELECT number, terms FROM documents WHERE doc_id = ?", (doc_id,)).fetchone()
+                old = json.loads(row[1]) if row else {}
+                terms = dict(old)
+                for field, keywords in fields.items():
+                    if field in FIELDS:
+                        keywords = {normalize_term(keyword) for keyword in keywords} - {""}
+                        terms[field] = sorted(keywords | set(old.get(field, [])) if merge else keywords)
+                if row:
+                    number = row[0]
+                    conn.execute("UPDATE documents SET terms = ?, updated_at = ? WHERE number = ?",
+                                 (json.dumps(terms), time.time(), number))
+                else:
+                    number = conn.execute("INSERT INTO documents (doc_id, terms, updated_at) VALUES (?, ?, ?)",
+                                          (doc_id, json.dumps(terms), time.time())).lastrowid
+                for field, keywords in old.items():
+                    for keyword in keywords:
+                        removed[(field, keyword)].append(number)
+                for field, keywords in terms.items():
+                    for keyword in keywords:
+                        added[(field, keyword)].append(number)
+                registered.append((doc_id, terms, number))
+            postings = {}
+            for field, keyword in set(removed) | set(added):
+                row = conn.execute("SELECT bitmap FROM postings WHERE field = ? AND term = ?",
+                                   (field, keyword)).fetchone()
+                bitmap = int.from_bytes(row[0], "little") if row else 0
+                bitmap &= ~bitmap_from_positions(removed.get((field, keyword), []))
+                bitmap |= bitmap_from_positions(added.get((field, keyword), []))
+                postings[(field, keyword)] = bitmap
+                if bitmap:
+                    conn.execute("INSERT OR REPLACE INTO postings (field, term, bitmap) VALUES (?, ?, ?)",
+                                 (field, keyword, _bitmap_bytes(bitmap)))
+                else:
+                    conn.execute("DELETE FROM postings WHERE field = ? AND term = ?", (field, keyword))
+            conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'version'")
+            if stale:
+                # Someone else wrote since the last load: take everything from the database
+                self._load(conn)
+                return
+            self.version = self._version(conn)
+            kinds = defaultdict(list)
+            for doc_id, terms, number in registered:
+                kinds[self._register(doc_id, terms, number)].append(number)
+            for kind, numbers in kinds.items():
+                self.kinds[kind] = self.kinds.get(kind, 0) | bitmap_from_positions(numbers)
+            for key, bitmap in postings.items():
+                if bitmap:
+                    self.postings[key] = bitmap
+                else:
+                    self.postings.pop(key, None)
+
+    def add(self, doc_id, merge=False, **fields):
+        self.add_many([(doc_id, fields)], merge)
+
+    # Stored keywords of a document by field, or None for an unknown document
+    def document_terms(self, doc_id):
+        self.refresh()
+        with self._lock:
+            number = self.doc_numbers.get(doc_id)
+            return None if number is None else dict(self.doc_terms[number])
+
+    def _term(self, token):
+        field, _sep, term = token.partition(":") if re.match(r"^\w+:", token) else ("", "", token)
+        if field and field not in FIELDS:
+            raise QueryError(f"Unknown field {field!r}; use one of {', '.join(FIELDS)}")
+        term = normalize_term(term.strip('"'))
+        bitmap = 0
+        for name in (field,) if field else DEFAULT_FIELDS:
+            bitmap |= self.postings.get((name, term), 0)
+        return bitmap
+
+    # Evaluate a boolean query to a bitmap. Terms can be quoted ("power bi") and prefixed with a field
+    # (missing:terraform); adjacent terms are ANDed, and AND binds tighter than OR.
+    def evaluate(self, query):
+        self.refresh()
+        tokens = QUERY_TOKEN_RE.findall(query)
+        position = 0
+
+        def peek():
+            return tokens[position] if position < len(tokens) else None
+
+        def take():
+            nonlocal position
+            position += 1
+            return tokens[position - 1]
+
+        def parse_or():
+            bitmap = parse_and()
+            while peek() and peek().upper() == "OR":
+                take()
+                bitmap |= parse_and()
+            return bitmap
+
+        def parse_and():
+            bitmap = parse_not()
+            while peek() and peek() != ")" and peek().upper() != "OR":
+                if peek().upper() == "AND":
+                    take()
+                bitmap &= parse_not()
+            return bitmap
+
+        def parse_not():
+            if peek() and peek().upper() == "NOT":
+                take()
+                universe = 0
+                for bitmap in self.kinds.values():
+                    universe |= bitmap
+                return universe & ~parse_not()
+            return parse_atom()
+
+        def parse_atom():
+            token = peek()
+            if token is None or token == ")" or token.upper() in OPERATORS:
+                raise QueryError(f"Expected a keyword, got {token or 'end of query'!r}")
+            take()
+            if token == "(":
+                bitmap = parse_or()
+                if peek() != ")":
+                    raise QueryError("Missing closing parenthesis")
+                take()
+                return bitmap
+            return self._term(token)
+
+        with self._lock:
+            bitmap = parse_or()
+        if peek() is not None:
+            raise QueryError(f"Unexpected {peek()!r}")
+        return bitmap
+
+    # Document ids matching a query, optionally only of one kind ("candidate", "jd" or "match")
+    def query(self, query, kind=None, limit=None):
+        bitmap = self.evaluate(query)
+        if kind:
+            bitmap &= self.kinds.get(kind, 0)
+        numbers = bit_positions(bitmap)
+        if limit is not None:
+            numbers = numbers[:limit]
+        return [self.doc_ids[number] for number in numbers]
+
+    def count(self, query, kind=None):
+        bitmap = self.evaluate(query)
+        if kind:
+            bitmap &= self.kinds.get(kind, 0)
+        return bitmap.bit_count()
+
+    def stats(self):
+        self.refresh()
+        return {"documents": len(self.doc_numbers), "keywords": len(self.postings),
+                "kinds": {kind: bitmap.bit_count() for kind, bitmap in self.kinds.items()}}
+
+
+SKILLS = ["python", "go", "java", "sql", "kubernetes", "docker", "terraform", "aws", "azure", "gcp", "spark",
+          "airflow", "kafka", "react", "typescript", "rust", "linux", "tableau", "power bi", "excel"]
+
+
+# Fill an index with synthetic candidates and time a few boolean queries over it
+def bench(documents, repeat):
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as directory:
+        index = KeywordIndex(os.path.join(directory, "index.sqlite3"))
+        started = time.perf_counter()
+        index.add_many((f"match:{i}", {"has": rng.sample(SKILLS, 6), "missing": rng.sample(SKILLS, 3)})
+                       for i in range(documents))
+        print(f"indexed {documents:,} documents in {time.perf_counter() - started:.1f}s")
+        started = time.perf_counter()
+        index = KeywordIndex(index.path)
+        print(f"reloaded from disk in {(time.perf_counter() - started) * 1000:.0f} ms")
+        for query in ["kubernetes AND go AND missing:terraform", "(python OR java) AND NOT aws",
+                      'sql AND "power bi" AND NOT missing:tableau']:
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                matches = index.count(query, kind="match")
+                timings.append(time.perf_counter() - started)
+            print(f"{query:<45} {matches:>7,} matches  median {statistics.median(timings) * 1000:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the keyword index of analysed resumes and job descriptions")
+    commands = parser.add_subparsers(dest="command", required=True)
+    query = commands.add_parser("query", help='Boolean query, e.g. kubernetes AND go AND missing:terraform')
+    query.add_argument("expression")
+    query.add_argument("--kind", choices=["candidate", "jd", "match"], help="Only return this kind of document")
+    query.add_argument("--limit", type=int, default=50)
+    commands.add_parser("stats", help="Documents and keywords in the index")
+    benchmark = commands.add_parser("bench", help="Time queries over a synthetic index")
+    benchmark.add_argument("--documents", type=int, default=100000)
+    benchmark.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    if args.command == "bench":
+        bench(args.documents, args.repeat)
+        return
+    index = KeywordIndex()
+    if args.command == "stats":
+        print(json.dumps(index.stats(), indent=2))
+        return
+    try:
+        started = time.perf_counter()
+        total = index.count(args.expression, args.kind)
+        matches = index.query(args.expression, args.kind, args.limit)
+    except QueryError as e:
+        parser.error(str(e))
+    print(f"{total} match(es) in {(time.perf_counter() - started) * 1000:.2f} ms")
+    for doc_id in matches:
+        print(doc_id)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import hashlib
+import re
+
+from cache import TTLCache
+from prompts import PROMPTS
+
+PARAGRAPH_SPLIT_RE = re.compile(r"\n\s*\n")
+WHITESPACE_RE = re.compile(r"\s+")
+
+# Suggestions per paragraph hash, shared across sessions so unchanged paragraphs are never re-analysed
+PARAGRAPH_CACHE = TTLCache(maxsize=4096, ttl=6 * 3600)
+
+
+def split_paragraphs(text):
+    return [paragraph.strip() for paragraph in PARAGRAPH_SPLIT_RE.split(text or "") if paragraph.strip()]
+
+
+# Hash of a paragraph that ignores line wrapping and spacing changes. The prompt version is part of the
+# key, so changing the paragraph_suggestions prompt invalidates earlier suggestions.
+def paragraph_key(paragraph):
+    text = f"{PROMPTS['paragraph_suggestions'].version}\n{WHITESPACE_RE.sub(' ', paragraph).strip()}"
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+# Split the content and look each paragraph up in the cache.
+# Returns [(paragraph, key, suggestions or None)] in document order.
+def diff_paragraphs(text):
+    return [(paragraph, key, PARAGRAPH_CACHE.get(key))
+            for paragraph, key in ((p, paragraph_key(p)) for p in split_paragraphs(text))]
+
+
+# Numbered block of the paragraphs that still need suggestions, for the paragraph_suggestions prompt
+def format_pending(pending):
+    return "\n\n".join(f"[{number}]\n{paragraph}" for number, (paragraph, _key) in enumerate(pending, 1))
+
+
+# Store the model's suggestions for the paragraphs its answer covers. Returns the keys stored; paragraphs
+# missing from the answer, or whose entry is malformed, are left out so they count as failed.
+def store_suggestions(pending, parsed):
+    items = parsed.get("Paragraphs") if isinstance(parsed, dict) else None
+    if not isinstance(items, list):
+        return set()
+    by_number = {}
+    for item in items:
+        try:
+            suggestions = item.get("Suggestions", [])
+            if isinstance(suggestions, str):
+                suggestions = [suggestions]
+            if isinstance(suggestions, list):
+                by_number[int(item.get("Paragraph"))] = [str(s) for s in suggestions]
+        except (TypeError, ValueError, AttributeError):
+            continue
+    stored = set()
+    for number, (_paragraph, key) in enumerate(pending, 1):
+        if number in by_number:
+            PARAGRAPH_CACHE.set(key, by_number[number])
+            stored.add(key)
+    return stored
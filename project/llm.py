@@ -0,0 +1,229 @@
+import json
+import os
+import re
+import time
+from collections import deque, namedtuple
+
+import google.ai.generativelanguage as glm
+import google.generativeai as genai
+from google.generativeai.types import GenerateContentResponse
+
+from cache import TTLCache
+from cassette import Cassette, cassette_mode
+from generation_profiles import generation_config, is_deterministic, load_profiles
+from key_pool import KeyPool, load_keys
+from resilience import (CircuitBreaker, ModelUnavailable, call_with_timeout, is_backend_failure, is_throttled,
+                        make_executor)
+from routing import ModelRouter
+from stub_model import stub_generate
+from text_normalize import estimate_tokens
+
+# Exact-match cache of model answers keyed by the rendered prompt, shared by all sessions in the process
+RESPONSE_CACHE = TTLCache(maxsize=int(os.getenv("RESPONSE_CACHE_SIZE", "512")),
+                          ttl=float(os.getenv("RESPONSE_CACHE_TTL", "3600")))
+ROUTER = ModelRouter()
+RESILIENCE = ROUTER.routes.get("resilience", {})
+# Bounded pool for model calls, so a slow backend cannot pile up an unbounded number of threads
+EXECUTOR = make_executor(RESILIENCE.get("max_workers", 32))
+BREAKERS = {}
+PROFILES = load_profiles()
+# Shared API keys from GEMINI_API_KEYS / GEMINI_API_KEYS_FILE; empty when each user brings their own key
+KEY_POOL = KeyPool(load_keys())
+# One generative service client per API key, so calls never depend on the global genai.configure state
+CLIENTS = TTLCache(maxsize=256, ttl=3600)
+# Recent generations, newest last, for seeing which model served which feature
+REQUEST_LOG = deque(maxlen=1000)
+# Recorded model calls, written or served according to LLM_CASSETTE_MODE (off, record or replay)
+CASSETTE = Cassette()
+
+TRAILING_COMMA_RE = re.compile(r",\s*]")
+JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+Generation = namedtuple("Generation", ["text", "feature", "model", "tier", "seconds", "cached", "output_tokens",
+                                       "truncated"])
+
+
+# Feature name of a prompt: the template name for rendered prompts, "default" for plain strings
+def prompt_feature(prompt):
+    return getattr(prompt, "name", "default")
+
+
+# Return a cached answer for a rendered prompt, or None
+def cached_response(prompt):
+    key = getattr(prompt, "cache_key", None)
+    return RESPONSE_CACHE.get(key) if key else None
+
+
+def client_for(api_key):
+    client = CLIENTS.get(api_key)
+    if client is None:
+        client = glm.GenerativeServiceClient(client_options={"api_key": api_key})
+        CLIENTS.set(api_key, client)
+    return client
+
+
+# Send a prompt on a caller's key: a request built with the generative service types, sent on that key's
+# own client, and wrapped in the SDK's response type
+def _generate_with_key(prompt, model_name, timeout, config, api_key):
+    request = glm.GenerateContentRequest(
+        model=model_name if model_name.startswith("models/") else f"models/{model_name}",
+        contents=[glm.Content(role="user", parts=[glm.Part(text=str(prompt))])],
+        generation_config=glm.GenerationConfig(**config))
+    return GenerateContentResponse.from_response(client_for(api_key).generate_content(request, timeout=timeout))
+
+
+# Returns the answer text, its input and output tokens and whether it was cut off at max_output_tokens
+def _send_to_backend(prompt, model_name, timeout, config, api_key):
+    if os.getenv("LLM_BACKEND") == "stub":
+        text = stub_generate(prompt, model_name, config, api_key)
+        tokens = estimate_tokens(text)
+        return (text, estimate_tokens(str(prompt)), tokens,
+                bool(config.get("max_output_tokens")) and tokens >= config["max_output_tokens"])
+    if api_key:
+        response = _generate_with_key(prompt, model_name, timeout, config, api_key)
+    else:
+        model = genai.GenerativeModel(model_name, generation_config=config)
+        response = model.generate_content(str(prompt), request_options={"timeout": timeout})
+    usage = getattr(response, "usage_metadata", None)
+    input_tokens = getattr(usage, "prompt_token_count", 0) or estimate_tokens(str(prompt))
+    tokens = getattr(usage, "candidates_token_count", 0) or estimate_tokens(response.text)
+    finish_reason = response.candidates[0].finish_reason if response.candidates else None
+    return response.text, input_tokens, tokens, getattr(finish_reason, "name", "") == "MAX_TOKENS"
+
+
+# One model call. With LLM_CASSETTE_MODE=replay the answer comes from the recorded cassettes instead of a
+# backend; with record, every answer is appended to a cassette with its latency and token usage.
+def _send(prompt, model_name, timeout, config, api_key):
+    mode = cassette_mode()
+    if mode == "replay":
+        return CASSETTE.replay(prompt)
+    started = time.perf_counter()
+    text, input_tokens, tokens, truncated = _send_to_backend(prompt, model_name, timeout, config, api_key)
+    if mode == "record":
+        CASSETTE.record(prompt, model_name, text, time.perf_counter() - started, input_tokens, tokens, truncated)
+    return text, tokens, truncated
+
+
+# Returns the answer text, its output tokens and whether it was cut off at max_output_tokens.
+# The call uses the caller's own key when given. Otherwise, with a key pool configured, it uses a pooled
+# key that has budget left; a throttled key is ejected and the call retried on another one.
+def _call_model(prompt, model_name, timeout, config, api_key):
+    if api_key or not len(KEY_POOL):
+        return _send(prompt, model_name, timeout, config, api_key)
+    input_tokens = estimate_tokens(str(prompt))
+    for attempt in range(len(KEY_POOL)):
+        lease = KEY_POOL.acquire(input_tokens + (config.get("max_output_tokens") or 0))
+        try:
+            text, tokens, truncated = _send(prompt, model_name, timeout, config, lease.key)
+        except Exception as e:
+            if not is_throttled(e):
+                lease.release()
+                raise
+            KEY_POOL.eject(lease)
+            if attempt == len(KEY_POOL) - 1:
+                raise
+            continue
+        lease.release(input_tokens + tokens)
+        return text, tokens, truncated
+
+
+# Whether an error says something about the model's health for everyone. A 429 on a caller's own key
+# is that key's quota running out, so it neither trips the shared breaker nor steers the router.
+def is_shared_failure(error, api_key):
+    return is_backend_failure(error) and not (api_key and is_throttled(error))
+
+
+def breaker_for(model_name):
+    if model_name not in BREAKERS:
+        BREAKERS.setdefault(model_name, CircuitBreaker(RESILIENCE.get("breaker_failures", 5),
+                                                       RESILIENCE.get("breaker_reset_seconds", 30)))
+    return BREAKERS[model_name]
+
+
+# Call the model with a timeout, hedging idempotent JSON features, behind the model's circuit breaker
+def _call_resilient(prompt, feature, model_name, config, api_key):
+    breaker = breaker_for(model_name)
+    if not breaker.allow():
+        raise ModelUnavailable("The AI service is having trouble right now. Please try again in a minute.")
+    timeout = RESILIENCE.get("timeout_seconds", 60)
+    hedge_after = None
+    if feature in RESILIENCE.get("hedge_features", []):
+        hedge_after = ROUTER.hedge_delay(model_name, RESILIENCE.get("hedge_default_seconds", 15),
+                                         RESILIENCE.get("hedge_min_seconds", 2))
+    try:
+        answer = call_with_timeout(EXECUTOR, lambda: _call_model(prompt, model_name, timeout, config, api_key),
+                                   timeout, hedge_after)
+    except Exception as e:
+        if is_shared_failure(e, api_key):
+            breaker.record_failure()
+        else:
+            breaker.record_neutral()
+        raise
+    breaker.record_success()
+    return answer
+
+
+# Only complete, reproducible answers are shared through the response cache: not truncated, from a
+# deterministic profile (sampled features must be able to give a new answer), and for prompts that ask
+# for JSON, parseable, so a malformed answer is never served again on "Please try again"
+def is_cacheable(prompt, text, config, truncated):
+    if not getattr(prompt, "cache_key", None) or truncated or not is_deterministic(config):
+        return False
+    if getattr(prompt, "expects_json", False):
+        try:
+            parse_json_answer(text)
+        except ValueError:
+            return False
+    return True
+
+
+# Generate an answer for a prompt (a RenderedPrompt or a plain string) without touching the UI, so it can be
+# called from worker threads and command-line tools. The model is picked by the router unless given, and
+# the generation settings come from the feature's profile unless a config is given. The API key is passed
+# per call (never through global SDK state), so sessions with different keys can share the process.
+def generate(prompt, feature=None, model_name=None, config=None, api_key=None):
+    feature = feature or prompt_feature(prompt)
+    cached = cached_response(prompt)
+    if cached is not None:
+        return Generation(cached, feature, "cache", "cache", 0.0, True, 0, False)
+
+    tier = "override"
+    if model_name is None:
+        model_name, tier = ROUTER.choose(feature, len(str(prompt)))
+    if config is None:
+        config = generation_config(feature, PROFILES)
+    started = time.perf_counter()
+    try:
+        text, output_tokens, truncated = _call_resilient(prompt, feature, model_name, config, api_key)
+    except Exception as e:
+        if is_shared_failure(e, api_key):
+            ROUTER.record(model_name, time.perf_counter() - started, ok=False)
+        raise
+    seconds = time.perf_counter() - started
+    ROUTER.record(model_name, seconds, ok=True)
+
+    if is_cacheable(prompt, text, config, truncated):
+        RESPONSE_CACHE.set(prompt.cache_key, text)
+    generation = Generation(text, feature, model_name, tier, seconds, False, output_tokens, truncated)
+    REQUEST_LOG.append(generation._replace(text=None))
+    return generation
+
+
+# Parse a JSON answer, tolerating trailing commas in arrays and prose around the JSON object.
+# Raises ValueError with a readable message when there is no valid JSON.
+def parse_json_answer(response):
+    response = TRAILING_COMMA_RE.sub("]", response.strip())
+    try:
+        return json.loads(response)
+    except json.JSONDecodeError:
+        match = JSON_OBJECT_RE.search(response)
+        if not match:
+            raise ValueError("Could not find valid JSON in the response")
+        try:
+            return json.loads(match.group())
+        except json.JSONDecodeError as e:
+            raise ValueError(f"JSON parsing error in extracted content: {str(e)}")
+
+
+def generate_text(prompt, feature=None, model_name=None, config=None, api_key=None):
+    return generate(prompt, feature, model_name, config, api_key).text
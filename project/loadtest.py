@@ -0,0 +1,450 @@
+import argparse
+import asyncio
+import gc
+import json
+import os
+import resource
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import urllib.request
+import uuid
+from contextlib import contextmanager
+
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from streamlit.testing.v1 import AppTest
+
+from features import FEATURES
+from session_memory import ARTEFACTS, MB
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data_analysis.py")
+SAMPLE_JD = ("We are hiring a data analyst with strong SQL and Python skills, experience with Tableau or "
+             "Power BI dashboards, and the ability to explain insights to stakeholders.")
+SAMPLE_CONTENT = ("Data analyst with five years of experience building dashboards.\n\n"
+                  "Led the migration of weekly reports to Tableau, cutting preparation time in half.")
+
+# Feature flows that can be driven headlessly: (widget type, position among widgets of that type, value)
+# inputs and the key of the button that runs the feature. Uploads go through a separate HTTP endpoint that
+# the simulated browsers do not use, so the upload-based features are exercised through their shared
+# helpers by the batch tools instead.
+FLOWS = {
+    "analyze-jd": ([("text_area", 0, SAMPLE_JD)], "analyze_job_description"),
+    "company-info": ([("text_input", 0, "Acme Analytics")], "get_company_info"),
+    "real-time-suggestions": ([("text_area", 0, SAMPLE_CONTENT)], "get_suggestions"),
+    "generate-resume": ([("text_area", 0, SAMPLE_JD)], "generate_resume_cover_letter"),
+}
+SAMPLE_RESUME = ("Jane Doe\njane@example.com\n\nExperience\nData Analyst, Acme 2019 - 2024\n"
+                 "Built Tableau dashboards and automated SQL reporting in Python.\n\n"
+                 "Education\nBSc Statistics, 2015 - 2018\n\nSkills\nPython, SQL, Tableau, Excel")
+
+
+def current_rss():
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    if os.path.exists("/proc/self/statm"):
+        with open("/proc/self/statm") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    # ru_maxrss is the peak, in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+# CPU seconds used so far and current RSS of another process (the app server); zeros where neither psutil
+# nor /proc is available
+def process_usage(pid):
+    if psutil is not None:
+        process = psutil.Process(pid)
+        times = process.cpu_times()
+        return times.user + times.system, process.memory_info().rss
+    if not os.path.exists(f"/proc/{pid}/stat"):
+        return 0.0, 0
+    with open(f"/proc/{pid}/stat") as handle:
+        fields = handle.read().rsplit(")", 1)[1].split()
+    with open(f"/proc/{pid}/statm") as handle:
+        rss = int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK"), rss
+
+
+# Run the app under `streamlit run` on a free local port, as one replica would be deployed, and wait for its
+# health check. Yields the websocket URL and the server's pid; the server log goes to log_path, and its end
+# is included in the error when the server does not come up.
+@contextmanager
+def app_server(log_path, timeout):
+    def failed(reason):
+        with open(log_path, encoding="utf-8", errors="replace") as handle:
+            return RuntimeError(f"{reason}. Server log:\n{''.join(handle.readlines()[-20:])}")
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    with open(log_path, "w", encoding="utf-8") as log:
+        server = subprocess.Popen([sys.executable, "-m", "streamlit", "run", APP_PATH, "--server.headless=true",
+                                   "--server.address=127.0.0.1", f"--server.port={port}",
+                                   "--server.fileWatcherType=none", "--browser.gatherUsageStats=false"],
+                                  stdout=log, stderr=subprocess.STDOUT)
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            if server.poll() is not None:
+                raise failed(f"The app server exited with code {server.returncode}")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as response:
+                    if response.status == 200:
+                        break
+            except OSError:
+                pass
+            if time.monotonic() > deadline:
+                raise failed(f"The app server did not become healthy within {timeout:.0f}s")
+            time.sleep(0.2)
+        yield f"ws://127.0.0.1:{port}/_stcore/stream", server.pid
+    finally:
+        server.terminate()
+        try:
+            server.wait(10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+            server.wait()
+
+
+# One browser tab on the app, speaking Streamlit's websocket protocol. Like the frontend, every rerun
+# sends the values of the widgets on screen and waits for the script run (and any st.rerun it triggers)
+# to finish. Widgets are looked up among those the last run rendered, by type and position or by key.
+class BrowserSession:
+    def __init__(self, url, timeout):
+        self.url = url
+        self.timeout = timeout
+        self.websocket = None
+        self.widgets = {}
+        self.values = {}
+        self.errors = []
+
+    async def connect(self):
+        self.websocket = await websockets.connect(self.url, subprotocols=["streamlit"], max_size=None,
+                                                  open_timeout=self.timeout)
+
+    async def close(self):
+        if self.websocket is not None:
+            await self.websocket.close()
+
+    def find(self, element_type, index=0, key=None, label=None):
+        matches = [widget_id for widget_id, (kind, element) in self.widgets.items()
+                   if kind == element_type and (key is None or widget_id.endswith(f"-{key}"))
+                   and (label is None or element.label == label)]
+        if len(matches) <= index:
+            raise LookupError(f"No {element_type} {key or label or index} on the page")
+        return matches[index]
+
+    def has(self, element_type, label):
+        return any(kind == element_type and element.label == label for kind, element in self.widgets.values())
+
+    def set_text(self, element_type, index, value):
+        widget_id = self.find(element_type, index)
+        self.values[widget_id] = WidgetState(id=widget_id, string_value=value)
+
+    def select_feature(self, feature):
+        widget_id = self.find("selectbox")
+        label = FEATURES[feature].label
+        if label not in self.widgets[widget_id][1].options:
+            raise LookupError(f"No option {label!r} in the feature selectbox")
+        self.values[widget_id] = WidgetState(id=widget_id, string_value=label)
+
+    # Rerun the script, clicking the button with id `click` if given. Returns the seconds until the run
+    # finished; exceptions the page showed are added to errors.
+    async def rerun(self, click=None):
+        message = BackMsg()
+        message.rerun_script.widget_states.widgets.extend(self.values.values())
+        if click:
+            message.rerun_script.widget_states.widgets.append(WidgetState(id=click, trigger_value=True))
+        started = time.perf_counter()
+        await self.websocket.send(message.SerializeToString())
+        widgets = {}
+        while True:
+            forward = ForwardMsg()
+            forward.ParseFromString(await asyncio.wait_for(self.websocket.recv(), self.timeout))
+            kind = forward.WhichOneof("type")
+            if kind == "new_session":
+                widgets = {}
+            elif kind == "delta" and forward.delta.WhichOneof("type") == "new_element":
+                element_type = forward.delta.new_element.WhichOneof("type")
+                element = getattr(forward.delta.new_element, element_type)
+                if element_type == "exception":
+                    self.errors.append(f"{element.type}: {element.message}")
+                widget_id = getattr(element, "id", "")
+                if widget_id:
+                    widgets[widget_id] = (element_type, element)
+            elif kind == "script_finished" and forward.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                if forward.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    self.errors.append("The app failed to compile")
+                break
+        seconds = time.perf_counter() - started
+        # Widgets that are no longer on screen stop sending values, as in the browser
+        self.widgets = widgets
+        self.values = {widget_id: state for widget_id, state in self.values.items() if widget_id in widgets}
+        return seconds
+
+
+# One simulated user: open the app, enter an API key if asked, then pick a feature, fill the inputs and press
+# the button, repeatedly. Every rerun is timed. Inputs get a unique suffix unless cache hits are wanted.
+# Anything that goes wrong is recorded in errors, so a failed session is counted rather than lost.
+async def run_session(url, number, flow_names, iterations, cache_hits, timeout, interactions, latencies, errors):
+    session = BrowserSession(url, timeout)
+
+    async def timed(click=None):
+        latencies.append(await session.rerun(click))
+
+    try:
+        await session.connect()
+        await timed()
+        if session.has("button", "Validate API Key"):
+            session.set_text("text_input", 0, f"stub-key-session-{number}")
+            await timed(session.find("button", label="Validate API Key"))
+        for iteration in range(iterations):
+            flow_name = flow_names[iteration % len(flow_names)]
+            inputs, button_key = FLOWS[flow_name]
+            session.select_feature(flow_name)
+            await timed()
+            suffix = "" if cache_hits else f"\n\nRef {number}/{uuid.uuid4().hex[:8]}"
+            for widget, index, value in inputs:
+                session.set_text(widget, index, value + suffix)
+                await timed()
+            await timed(session.find("button", key=button_key))
+            # Later reruns with the result on screen, as when the user clicks around the page
+            for _ in range(interactions):
+                await timed()
+    except Exception as e:
+        errors.append(f"session {number} failed: {type(e).__name__}: {e}")
+    finally:
+        errors.extend(f"session {number}: {error}" for error in session.errors)
+        await session.close()
+
+
+# Run `sessions` simulated users at once against the one app server and return the level's row: rerun
+# latency as the users saw it, and the server process's CPU use and RSS.
+def run_level(url, server_pid, sessions, flow_names, iterations, cache_hits, timeout, interactions=0):
+    latencies = []
+    errors = []
+
+    async def run_all():
+        await asyncio.gather(*(run_session(url, number, flow_names, iterations, cache_hits, timeout, interactions,
+                                           latencies, errors)
+                               for number in range(sessions)))
+
+    cpu_started, _rss = process_usage(server_pid)
+    started = time.perf_counter()
+    asyncio.run(run_all())
+    elapsed = time.perf_counter() - started
+    cpu, rss = process_usage(server_pid)
+    cpu -= cpu_started
+    latencies.sort()
+    return {
+        "sessions": sessions,
+        "reruns": len(latencies),
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000 if latencies else 0.0,
+        "cpu_percent": 100 * cpu / elapsed if elapsed else 0.0,
+        "cpu_ms_per_rerun": cpu * 1000 / len(latencies) if latencies else 0.0,
+        "rss_mb": rss / (1024 * 1024),
+        "errors": len(errors),
+        "first_error": errors[0] if errors else "",
+    }
+
+
+# The ATS page with its upload replaced by a text resume in session state, since AppTest cannot drive
+# st.file_uploader: the same analysis, stored result and result panel with its strength chart
+def ats_page():
+    import streamlit as st
+
+    from app_helpers import analyze_resume_version, result_panel, store_result
+    from features.ats_resume import render_ats_result
+
+    text = st.session_state["soak_resume"]
+    if st.button("Analyze Resume", key="analyze_resume_only"):
+        parsed_response, previous, rescored = analyze_resume_version("ats_resume", text)
+        if parsed_response:
+            store_result("ats-resume", parsed_response, inputs=(text,), text=text, previous=previous,
+                         rescored=rescored)
+    result_panel("ats-resume", render_ats_result, inputs=(text,))
+
+
+# Live matplotlib figures, whether or not pyplot manages them
+def live_figures():
+    from matplotlib.figure import Figure
+
+    return sum(1 for value in gc.get_objects() if isinstance(value, Figure))
+
+
+# One session running `analyses` feature flows back to back, with unique inputs, under tracemalloc, and
+# alongside each flow an ATS analysis of a fresh resume version rendered with its chart in a second session.
+# Returns a row per sample (RSS, traced Python memory, live figures, both sessions' stored artefacts) and
+# the allocation sites that grew most between the end of the warm-up half and the end of the run.
+def soak(flow_names, analyses, samples, timeout):
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    at.session_state["api_key"] = "stub-key"
+    at.run()
+    ats = AppTest.from_function(ats_page, default_timeout=timeout)
+    ats.session_state["api_key"] = "stub-key"
+    ats.session_state["soak_resume"] = SAMPLE_RESUME
+    ats.run()
+    tracemalloc.start(10)
+    rows = []
+    warm = None
+    for number in range(1, analyses + 1):
+        flow_name = flow_names[number % len(flow_names)]
+        inputs, button_key = FLOWS[flow_name]
+        at.selectbox[0].select(flow_name).run()
+        for widget, index, value in inputs:
+            getattr(at, widget)[index].input(f"{value}\n\nRef soak/{uuid.uuid4().hex[:8]}").run()
+        at.button(key=button_key).click().run()
+        ats.session_state["soak_resume"] = f"{SAMPLE_RESUME}, Ref {uuid.uuid4().hex[:8]}"
+        ats.button(key="analyze_resume_only").click().run()
+        for test in (at, ats):
+            if test.exception:
+                raise RuntimeError(test.exception[0].value)
+        if not ats.get("image"):
+            raise RuntimeError("The ATS result panel did not render its chart")
+        if number % max(1, analyses // samples) == 0 or number == analyses:
+            gc.collect()
+            traced, _peak = tracemalloc.get_traced_memory()
+            used, artefacts = ARTEFACTS.usage(at.session_state["memory_session"])
+            ats_used, ats_artefacts = ARTEFACTS.usage(ats.session_state["memory_session"])
+            rows.append({"analyses": number, "rss_mb": current_rss() / (1024 * 1024), "traced_mb": traced / MB,
+                         "figures": live_figures(), "session_kb": (used + ats_used) / 1024,
+                         "artefacts": artefacts + ats_artefacts})
+            if warm is None and number >= analyses // 2:
+                warm = tracemalloc.take_snapshot()
+    growth = tracemalloc.take_snapshot().compare_to(warm, "lineno")[:5] if warm else []
+    tracemalloc.stop()
+    return rows, growth
+
+
+# Flag levels whose p50 or p99 grew by more than the tolerance compared with a saved run
+def compare(results, baseline_path, tolerance):
+    with open(baseline_path, encoding="utf-8") as handle:
+        baseline = {row["sessions"]: row for row in json.load(handle)["results"]}
+    regressions = []
+    for row in results:
+        before = baseline.get(row["sessions"])
+        if not before:
+            continue
+        for metric in ("p50_ms", "p99_ms"):
+            if before[metric] and row[metric] > before[metric] * (1 + tolerance):
+                regressions.append(f"{row['sessions']} sessions: {metric} {before[metric]:.0f} -> {row[metric]:.0f}")
+    return regressions
+
+
+# Soak run: print memory per sample and return whether memory stayed flat over the second half
+def report_soak(args, flow_names):
+    rows, growth = soak(flow_names, args.soak, 10, args.timeout)
+    print(f"{'analyses':>8} {'rss MB':>7} {'traced MB':>9} {'figures':>7} {'session KB':>10} {'artefacts':>9}")
+    for row in rows:
+        print(f"{row['analyses']:>8} {row['rss_mb']:>7.1f} {row['traced_mb']:>9.1f} {row['figures']:>7} "
+              f"{row['session_kb']:>10.1f} {row['artefacts']:>9}")
+    print("\nlargest allocation growth over the second half:")
+    for stat in growth:
+        print(f"  {stat}")
+    halfway = next(row for row in rows if row["analyses"] >= args.soak // 2)
+    # RSS includes allocator arenas and caches that are not handed back, so it is reported but not gated on
+    traced_growth = rows[-1]["traced_mb"] - halfway["traced_mb"]
+    rss_growth = rows[-1]["rss_mb"] - halfway["rss_mb"]
+    figure_growth = rows[-1]["figures"] - halfway["figures"]
+    print(f"\ntraced memory grew {traced_growth:.1f} MB over the second half "
+          f"(tolerance {args.soak_tolerance:.0f} MB), live figures by {figure_growth}; "
+          f"RSS grew {rss_growth:.1f} MB")
+    return traced_growth <= args.soak_tolerance and figure_growth <= 0
+
+
+# Load levels against one app server: print a row per level and return whether every session ran
+# without errors and no level regressed against the baseline
+def report_levels(args, flow_names, scratch):
+    print(f"stub latency {os.getenv('LLM_STUB_LATENCY', '0.5')}s, {args.iterations} flow(s) per session, "
+          f"{args.keys or 'no'} pooled key(s), one app server\n")
+    print(f"{'sessions':>8} {'reruns':>7} {'reruns/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'cpu %':>6} "
+          f"{'cpu ms':>7} {'rss MB':>7} {'errors':>6}")
+    results = []
+    with app_server(os.path.join(scratch, "server.log"), args.timeout) as (url, server_pid):
+        for sessions in (int(value) for value in args.sessions.split(",")):
+            row = run_level(url, server_pid, sessions, flow_names, args.iterations, args.cache_hits, args.timeout,
+                            args.interactions)
+            results.append(row)
+            print(f"{row['sessions']:>8} {row['reruns']:>7} {row['throughput']:>9.2f} {row['p50_ms']:>8.0f} "
+                  f"{row['p99_ms']:>8.0f} {row['cpu_percent']:>6.0f} {row['cpu_ms_per_rerun']:>7.1f} "
+                  f"{row['rss_mb']:>7.0f} {row['errors']:>6}")
+            if row["first_error"]:
+                print(f"         first error: {row['first_error']}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump({"latency": os.getenv("LLM_STUB_LATENCY", "0.5"), "results": results}, handle, indent=2)
+    passed = True
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        passed = not regressions
+    errors = sum(row["errors"] for row in results)
+    if errors:
+        print(f"\n{errors} session error(s); the latencies above are incomplete")
+    return passed and not errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive concurrent simulated browser sessions through one app "
+                                                 "server running against the offline stub model")
+    parser.add_argument("--sessions", default="1,2,4,8", help="Comma-separated concurrent session counts")
+    parser.add_argument("--iterations", type=int, default=3, help="Feature flows per session")
+    parser.add_argument("--flows", default=",".join(FLOWS), help=f"Flows to cycle through: {', '.join(FLOWS)}")
+    parser.add_argument("--latency", help="Stub model latency in seconds, e.g. 0.5 or 0.2-1.0")
+    parser.add_argument("--keys", type=int, help="Run with a pool of this many stub API keys")
+    parser.add_argument("--rpm", type=int, help="Requests-per-minute limit per pooled key")
+    parser.add_argument("--cache-hits", action="store_true", help="Reuse identical inputs so caches are hit")
+    parser.add_argument("--interactions", type=int, default=0,
+                        help="Extra reruns after each flow, with its result on screen")
+    parser.add_argument("--soak", type=int, help="Instead of the load levels, run this many analyses in one "
+                                                 "session and check memory stays flat")
+    parser.add_argument("--soak-tolerance", type=float, default=4,
+                        help="Allowed growth of traced Python memory in MB over the second half of a soak run")
+    parser.add_argument("--timeout", type=float, default=120, help="Per-rerun timeout in seconds")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--baseline", help="Compare against a JSON file written by --output")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed latency growth against the baseline")
+    args = parser.parse_args()
+
+    flow_names = [name.strip() for name in args.flows.split(",")]
+    unknown = [name for name in flow_names if name not in FLOWS]
+    if unknown:
+        parser.error(f"Unknown flows: {', '.join(unknown)}")
+    if args.latency:
+        os.environ["LLM_STUB_LATENCY"] = args.latency
+    if args.keys:
+        os.environ["GEMINI_API_KEYS"] = ",".join(f"stub-key-{i}" for i in range(1, args.keys + 1))
+    if args.rpm:
+        os.environ["KEY_RPM_LIMIT"] = str(args.rpm)
+
+    # Run the app against the offline stub model, with its caches in a scratch directory
+    scratch = tempfile.mkdtemp(prefix="loadtest-")
+    os.environ.setdefault("LLM_BACKEND", "stub")
+    os.environ.setdefault("COMPANY_CACHE_PATH", os.path.join(scratch, "company.sqlite3"))
+    os.environ.setdefault("KEYWORD_INDEX_PATH", os.path.join(scratch, "keyword_index.sqlite3"))
+    try:
+        passed = report_soak(args, flow_names) if args.soak else report_levels(args, flow_names, scratch)
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+    if not passed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
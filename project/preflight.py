@@ -0,0 +1,123 @@
+import os
+import re
+import threading
+from collections import Counter, namedtuple
+
+from sections import HEADER, segment_resume
+
+WORD_RE = re.compile(r"[^\W\d_]+")
+EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+\.[\w.]+")
+PHONE_RE = re.compile(r"\+?\d[\d\s().-]{7,}\d")
+YEAR_RE = re.compile(r"\b(19[5-9]\d|20[0-4]\d)\b")
+# Glyphs a PDF extractor could not map to characters
+CID_RE = re.compile(r"\(cid:\d+\)")
+# Common English function words; even terse resume bullets contain a few of them
+ENGLISH_WORDS = frozenset(
+    "a an and the of to in for on with at by from as is are was were be been has have had i my we our "
+    "this that it its or not but into over under using used through across within while which who".split()
+)
+# Characters a clean extraction is made of; replacement characters, (cid:NN) runs and stray symbols are not
+READABLE_PUNCTUATION = set(".,;:!?'\"()[]/&%+-–—•·*@#$|")
+MIN_WORDS_FOR_LANGUAGE = 60
+
+# Calls the gate avoided since the process started, by feature and reason
+AVOIDED_CALLS = Counter()
+_avoided_lock = threading.Lock()
+
+
+def _limit(name, default):
+    return float(os.getenv(name, default))
+
+
+# Outcome of a pre-flight check. Problems ({reason: message}) block the model call; warnings are shown
+# but let it through.
+class Preflight(namedtuple("Preflight", ["problems", "warnings", "scores"])):
+    __slots__ = ()
+
+    @property
+    def blocked(self):
+        return bool(self.problems)
+
+
+# Share of characters that are letters, digits, whitespace or ordinary punctuation
+def readable_share(text):
+    if not text:
+        return 0.0
+    readable = sum(ch.isalnum() or ch.isspace() or ch in READABLE_PUNCTUATION for ch in CID_RE.sub("", text))
+    return round(readable / len(text), 3)
+
+
+# Share of words that are English function words, and share of letters outside the Latin alphabet
+def language_scores(text):
+    words = [word.casefold() for word in WORD_RE.findall(text or "")]
+    letters = [ch for word in words for ch in word]
+    english = sum(word in ENGLISH_WORDS for word in words) / len(words) if words else 0.0
+    non_latin = sum(not ("a" <= ch <= "z" or "À" <= ch <= "ɏ") for ch in letters) / len(letters) \
+        if letters else 0.0
+    return len(words), round(english, 3), round(non_latin, 3)
+
+
+def _language_warnings(words, english, non_latin, what):
+    if non_latin > _limit("PREFLIGHT_MAX_NON_LATIN", "0.3"):
+        return [f"The {what} is mostly in a non-Latin script; the analysis is written for English text "
+                "and may be unreliable."]
+    if words >= MIN_WORDS_FOR_LANGUAGE and english < _limit("PREFLIGHT_MIN_ENGLISH", "0.03"):
+        return [f"The {what} does not look like English; the analysis may be unreliable."]
+    return []
+
+
+# Check extracted resume (or profile) text before it is sent to the model: enough text, cleanly
+# extracted, in English, and shaped like a resume (section headings, contact details, dates)
+def check_resume(text, what="resume"):
+    text = text or ""
+    words, english, non_latin = language_scores(text)
+    sections = [name for name in segment_resume(text) if name != HEADER]
+    signals = sum([len(sections) >= 2, bool(EMAIL_RE.search(text) or PHONE_RE.search(text)),
+                   len(YEAR_RE.findall(text)) >= 2])
+    scores = {"chars": len(text), "words": words, "readable": readable_share(text), "english": english,
+              "non_latin": non_latin, "sections": len(sections), "resume_signals": signals}
+
+    problems = {}
+    warnings = []
+    if len(text.strip()) < _limit("PREFLIGHT_MIN_RESUME_CHARS", "200"):
+        problems["too_short"] = (f"Only {len(text.strip())} characters of text were found in the {what}. "
+                                 "If it is a scanned document, please upload a text-based PDF.")
+    elif scores["readable"] < _limit("PREFLIGHT_MIN_READABLE", "0.85"):
+        problems["unreadable"] = (f"The text extracted from the {what} is mostly unreadable symbols "
+                                  f"({scores['readable']:.0%} readable). Please export it to PDF again "
+                                  "or upload another file.")
+    elif signals == 0:
+        problems["not_a_resume"] = (f"This does not look like a {what}: no section headings, contact details "
+                                    "or dates were found.")
+    elif signals == 1 and not sections:
+        warnings.append(f"No section headings were recognised in the {what}; results may be less specific.")
+    if not problems:
+        warnings.extend(_language_warnings(words, english, non_latin, what))
+    return Preflight(problems, warnings, scores)
+
+
+# Check a pasted job description: long enough to analyse and in English
+def check_jd(text):
+    text = text or ""
+    words, english, non_latin = language_scores(text)
+    scores = {"chars": len(text), "words": words, "english": english, "non_latin": non_latin}
+    min_words = int(_limit("PREFLIGHT_MIN_JD_WORDS", "20"))
+    if words < min_words:
+        return Preflight({"too_short": f"The job description has {words} word(s); paste the full posting "
+                                       f"(at least {min_words} words) for a useful analysis."}, [], scores)
+    return Preflight({}, _language_warnings(words, english, non_latin, "job description"), scores)
+
+
+# Count one model call avoided for a feature, with the reasons its inputs were rejected
+def record_avoided(feature, reasons):
+    with _avoided_lock:
+        for reason in reasons:
+            AVOIDED_CALLS[(feature, reason)] += 1
+        AVOIDED_CALLS[(feature, None)] += 1
+
+
+# Model calls avoided so far, in total and per feature
+def avoided_calls():
+    with _avoided_lock:
+        per_feature = {feature: count for (feature, reason), count in AVOIDED_CALLS.items() if reason is None}
+    return sum(per_feature.values()), per_feature
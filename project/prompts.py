@@ -0,0 +1,344 @@
+import hashlib
+import re
+import textwrap
+from collections import namedtuple
+
+from text_normalize import estimate_tokens
+
+TRAILING_SPACE_RE = re.compile(r"[ \t]+\n")
+BLANK_LINES_RE = re.compile(r"\n{3,}")
+
+
+# Dedent a block, strip trailing spaces and extra blank lines so edits to the
+# surrounding code never change the rendered prompt
+def normalize_block(text):
+    text = textwrap.dedent(text).replace("\r\n", "\n").strip()
+    text = TRAILING_SPACE_RE.sub("\n", text + "\n")
+    return BLANK_LINES_RE.sub("\n\n", text).strip()
+
+
+def _sha256(*parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class RenderedPrompt(namedtuple("RenderedPrompt", ["name", "version", "prefix", "payload"])):
+    __slots__ = ()
+
+    @property
+    def text(self):
+        return f"{self.prefix}\n\n{self.payload}" if self.payload else self.prefix
+
+    # Exact-match key for the whole prompt
+    @property
+    def cache_key(self):
+        return _sha256(self.name, str(self.version), self.prefix, self.payload)
+
+    # Whether the instructions ask for a JSON answer
+    @property
+    def expects_json(self):
+        return "JSON format" in self.prefix
+
+    def __str__(self):
+        return self.text
+
+
+# A versioned prompt: static instructions first, then the labelled payload fields in a fixed order.
+# Bump the version whenever the instructions change in a way that should invalidate cached answers.
+class PromptTemplate:
+    def __init__(self, name, version, instructions, fields):
+        self.name = name
+        self.version = version
+        self.instructions = normalize_block(instructions)
+        self.fields = fields
+
+    def render(self, **values):
+        blocks = []
+        for label, key in self.fields:
+            value = values.get(key)
+            if isinstance(value, (list, tuple)):
+                value = ", ".join(value)
+            if value:
+                blocks.append(f"{label}:\n{normalize_block(str(value))}")
+        return RenderedPrompt(self.name, self.version, self.instructions, "\n\n".join(blocks))
+
+
+PROMPTS = {}
+
+
+def register(template):
+    PROMPTS[template.name] = template
+    return template
+
+
+def render_prompt(name, **values):
+    return PROMPTS[name].render(**values)
+
+
+RESUME = ("Resume", "resume")
+JOB_DESCRIPTION = ("Job Description", "jd")
+RESUME_SECTIONS = ("Resume Sections", "section_names")
+CHANGED_SECTIONS = ("Changed Sections", "changed")
+UNCHANGED_SECTIONS = ("Unchanged Sections", "unchanged")
+PREVIOUS_ANALYSIS = ("Previous Analysis", "previous")
+
+register(PromptTemplate("keyword_suggestions", 1, """
+    Given the following missing keywords from a resume and the job description,
+    provide specific suggestions on how to incorporate these keywords into the resume effectively.
+    Consider the context of the job description when making suggestions.
+
+    Please provide detailed suggestions for each keyword, including:
+    1. Where in the resume to add the keyword (e.g., skills section, work experience, etc.)
+    2. How to phrase it naturally within the context of the resume
+    3. If applicable, suggest a brief example of how to demonstrate experience with the keyword
+
+    Format your response as a bulleted list for easy reading.
+""", [("Missing Keywords", "missing_keywords"), JOB_DESCRIPTION]))
+
+register(PromptTemplate("ats_resume", 2, """
+    Analyze this resume and provide:
+    1. An overall ATS score (0-100)
+    2. Strengths of the resume
+    3. Areas for improvement
+    4. Keyword analysis
+    5. Formatting and structure assessment
+    6. An ATS score (0-100) for each of the listed resume sections
+
+    Provide the response in the following JSON format:
+    {
+        "ATS_Score": <score>,
+        "Strengths": ["<strength1>", "<strength2>", ...],
+        "Improvements": ["<improvement1>", "<improvement2>", ...],
+        "Keywords": ["<keyword1>", "<keyword2>", ...],
+        "Formatting": "<formatting_assessment>",
+        "Section_Scores": {"<section_name>": <score>, ...}
+    }
+""", [RESUME, RESUME_SECTIONS]))
+
+register(PromptTemplate("ats_resume_revision", 1, """
+    This resume was analysed before and has since been revised. Only the changed sections are given below,
+    labelled with their section names, together with the previous analysis. Please:
+    1. Score each changed section for ATS performance (0-100)
+    2. Update the strengths and areas for improvement of the whole resume to reflect the changes
+    3. List the keywords detected in the changed sections
+    4. Reassess formatting only if the changes affect it; otherwise repeat the previous assessment
+
+    Provide the response in the following JSON format:
+    {
+        "Section_Scores": {"<section_name>": <score>, ...},
+        "Strengths": ["<strength1>", "<strength2>", ...],
+        "Improvements": ["<improvement1>", "<improvement2>", ...],
+        "Keywords": ["<keyword1>", "<keyword2>", ...],
+        "Formatting": "<formatting_assessment>"
+    }
+""", [CHANGED_SECTIONS, UNCHANGED_SECTIONS, PREVIOUS_ANALYSIS]))
+
+register(PromptTemplate("ats_resume_jd", 2, """
+    Analyze this resume against the job description and provide:
+    1. An ATS compatibility score (0-100)
+    2. Matched keywords between the resume and job description
+    3. Missing keywords from the job description
+    4. Suggestions for improvement
+    5. Overall assessment of the resume's fit for the position
+    6. A compatibility score (0-100) for each of the listed resume sections
+
+    Provide the response in the following JSON format:
+    {
+        "ATS_Compatibility_Score": <score>,
+        "Matched_Keywords": ["<keyword1>", "<keyword2>", ...],
+        "Missing_Keywords": ["<keyword1>", "<keyword2>", ...],
+        "Improvement_Suggestions": ["<suggestion1>", "<suggestion2>", ...],
+        "Overall_Assessment": "<assessment_text>",
+        "Section_Scores": {"<section_name>": <score>, ...}
+    }
+""", [RESUME, JOB_DESCRIPTION, RESUME_SECTIONS]))
+
+register(PromptTemplate("ats_resume_jd_revision", 1, """
+    This resume was analysed against the job description before and has since been revised. Only the changed
+    sections are given below, labelled with their section names, together with the previous analysis. Please:
+    1. Score each changed section's compatibility with the job description (0-100)
+    2. List the job description keywords that appear in the changed sections
+    3. Update the suggestions for improvement to reflect the changes
+    4. Update the overall assessment of the resume's fit for the position
+
+    Provide the response in the following JSON format:
+    {
+        "Section_Scores": {"<section_name>": <score>, ...},
+        "Matched_Keywords": ["<keyword1>", "<keyword2>", ...],
+        "Improvement_Suggestions": ["<suggestion1>", "<suggestion2>", ...],
+        "Overall_Assessment": "<assessment_text>"
+    }
+""", [CHANGED_SECTIONS, UNCHANGED_SECTIONS, JOB_DESCRIPTION, PREVIOUS_ANALYSIS]))
+
+register(PromptTemplate("content_suggestions", 1, """
+    Provide real-time suggestions for improving this resume or cover letter content.
+
+    Please provide suggestions for:
+    1. Improving clarity and conciseness
+    2. Enhancing the impact of achievements
+    3. Optimizing for ATS systems
+    4. Addressing any grammatical or structural issues
+
+    Format your response as a bulleted list for easy reading.
+""", [("Content", "content")]))
+
+register(PromptTemplate("paragraph_suggestions", 1, """
+    Provide suggestions for improving each numbered paragraph of this resume or cover letter content.
+
+    For each paragraph, suggest improvements to:
+    1. Clarity and conciseness
+    2. The impact of achievements
+    3. ATS optimization
+    4. Grammar and structure
+
+    Keep each suggestion to one sentence. Return an empty list for a paragraph that needs no changes.
+
+    Provide the response in the following JSON format:
+    {
+        "Paragraphs": [
+            {"Paragraph": <number>, "Suggestions": ["<suggestion1>", "<suggestion2>", ...]},
+            ...
+        ]
+    }
+""", [("Paragraphs", "paragraphs")]))
+
+register(PromptTemplate("generate_resume", 1, """
+    Generate a tailored resume and cover letter based on the job description below.
+
+    Please provide:
+    1. A bullet-point outline for a tailored resume
+    2. A draft cover letter
+
+    If a current resume is provided, use it as a base and suggest improvements to tailor it to the job description.
+    Otherwise, create a new resume outline based on the job description.
+
+    Format your response as follows:
+
+    Resume Outline:
+    - [Section 1]
+      - [Bullet point 1]
+      - [Bullet point 2]
+    - [Section 2]
+      - [Bullet point 1]
+      - [Bullet point 2]
+
+    Cover Letter:
+    [Cover letter text]
+""", [RESUME, JOB_DESCRIPTION]))
+
+register(PromptTemplate("analyze_jd", 1, """
+    Analyze this job description and extract:
+    1. Essential skills required
+    2. Key qualifications
+    3. Main responsibilities
+    4. Company culture indicators
+    5. Potential keywords for resume optimization
+
+    Provide the response in the following JSON format:
+    {
+        "Essential_Skills": ["<skill1>", "<skill2>", ...],
+        "Key_Qualifications": ["<qualification1>", "<qualification2>", ...],
+        "Main_Responsibilities": ["<responsibility1>", "<responsibility2>", ...],
+        "Company_Culture": ["<indicator1>", "<indicator2>", ...],
+        "Resume_Keywords": ["<keyword1>", "<keyword2>", ...]
+    }
+""", [JOB_DESCRIPTION]))
+
+register(PromptTemplate("company_info", 1, """
+    Provide detailed information about the company below that would be helpful for a job interview. Include:
+    1. Brief company history
+    2. Main products or services
+    3. Company culture and values
+    4. Key competitors
+
+    Format the response in a clear, easy-to-read structure with headings for each section.
+""", [("Company", "company")]))
+
+register(PromptTemplate("linkedin", 1, """
+    Analyze this LinkedIn profile and provide:
+    1. An overall profile strength score (0-100)
+    2. Strengths of the profile
+    3. Areas for improvement
+    4. Suggestions for enhancing visibility and reach
+    5. Keyword optimization recommendations
+    6. Content ideas for posts or articles
+
+    Provide the response in the following JSON format:
+    {
+        "Profile_Strength": <score>,
+        "Strengths": ["<strength1>", "<strength2>", ...],
+        "Improvements": ["<improvement1>", "<improvement2>", ...],
+        "Visibility_Suggestions": ["<suggestion1>", "<suggestion2>", ...],
+        "Keyword_Recommendations": ["<keyword1>", "<keyword2>", ...],
+        "Content_Ideas": ["<idea1>", "<idea2>", ...]
+    }
+""", [("LinkedIn Profile", "profile")]))
+
+register(PromptTemplate("interview_questions", 1, """
+    Based on the following job description and resume, generate 10 likely interview questions.
+    Return only the questions; answers are prepared separately.
+
+    Provide the response in the following JSON format:
+    {
+        "Interview_Questions": ["<question1>", "<question2>", ...]
+    }
+""", [RESUME, JOB_DESCRIPTION]))
+
+register(PromptTemplate("interview_answers", 1, """
+    Based on the following job description and resume, for each of the interview questions listed:
+    1. Provide a suggested answer using the STAR (Situation, Task, Action, Result) method
+    2. Offer additional tips for answering the question effectively
+
+    Answer the questions in the order given.
+
+    Provide the response in the following JSON format:
+    {
+        "Interview_Questions": [
+            {
+                "Question": "<question1>",
+                "STAR_Answer": {
+                    "Situation": "<situation>",
+                    "Task": "<task>",
+                    "Action": "<action>",
+                    "Result": "<result>"
+                },
+                "Additional_Tips": ["<tip1>", "<tip2>", ...]
+            },
+            ...
+        ]
+    }
+""", [RESUME, JOB_DESCRIPTION, ("Interview Questions", "questions")]))
+
+register(PromptTemplate("skill_gap", 2, """
+    Based on the following resume and job description, please:
+    1. Identify the skills present in the resume
+    2. Identify the skills required by the job description
+    3. Determine the skill gaps (skills required but not present in the resume)
+
+    Name each skill briefly (for example "Kubernetes" or "Financial Modeling"), without explanations.
+
+    Provide the response in the following JSON format:
+    {
+        "Skills_in_Resume": ["<skill1>", "<skill2>", ...],
+        "Skills_Required": ["<skill1>", "<skill2>", ...],
+        "Skill_Gaps": ["<skill1>", "<skill2>", ...]
+    }
+""", [RESUME, JOB_DESCRIPTION]))
+
+
+# Size of each template's static prefix, for tracking prompt growth per feature
+def prompt_sizes():
+    return {
+        name: {"version": template.version, "chars": len(template.instructions),
+               "tokens": estimate_tokens(template.instructions)}
+        for name, template in PROMPTS.items()
+    }
+
+
+if __name__ == "__main__":
+    print(f"{'template':<22} {'version':>7} {'chars':>6} {'tokens':>7}")
+    for name, size in prompt_sizes().items():
+        print(f"{name:<22} {size['version']:>7} {size['chars']:>6} {size['tokens']:>7}")
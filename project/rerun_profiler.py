@@ -0,0 +1,130 @@
+import cProfile
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+import streamlit as st
+
+from session_memory import MB, recall, remember, session_usage
+
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "profiles")
+TOP_FUNCTIONS = 25
+
+
+# Profiling is on with APP_PROFILE=1 for every session. With APP_PROFILE_ALLOW_QUERY=1 a single session can
+# also turn it on with ?profile=1 in the URL; otherwise visitors cannot.
+def profiling_enabled():
+    if os.getenv("APP_PROFILE") == "1":
+        return True
+    return os.getenv("APP_PROFILE_ALLOW_QUERY") == "1" and st.query_params.get("profile") == "1"
+
+
+def _frame_name(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+# Samples the stack of one thread every `interval` seconds and counts identical stacks, which is
+# the collapsed-stack format flame graph tools (flamegraph.pl, speedscope, inferno) read
+class StackSampler:
+    def __init__(self, thread_id, interval=0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="rerun-stack-sampler", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            names = []
+            while frame is not None:
+                names.append(_frame_name(frame))
+                frame = frame.f_back
+            if names:
+                self.stacks[";".join(reversed(names))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def collapsed(self):
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+# The functions with the most cumulative time in profile stats, as table rows
+def top_functions(stats, limit=TOP_FUNCTIONS):
+    rows = []
+    for (filename, line, name), (_calls, calls, own, cumulative, _callers) in stats.stats.items():
+        rows.append({"function": f"{name} ({os.path.basename(filename)}:{line})", "calls": calls,
+                     "own ms": round(own * 1000, 1), "cumulative ms": round(cumulative * 1000, 1)})
+    rows.sort(key=lambda row: row["cumulative ms"], reverse=True)
+    return rows[:limit]
+
+
+# Write the last profiled rerun to disk: collapsed stacks for flame graphs and the cProfile stats.
+# Only with APP_PROFILE=1 on the server.
+def dump_profile():
+    last = recall("last_profile")
+    if not last or os.getenv("APP_PROFILE") != "1":
+        return
+    directory = os.getenv("APP_PROFILE_DIR", DEFAULT_DIR)
+    os.makedirs(directory, exist_ok=True)
+    base = os.path.join(directory, f"rerun-{time.strftime('%Y%m%d-%H%M%S')}-{last['rerun']}")
+    with open(f"{base}.folded", "w", encoding="utf-8") as handle:
+        handle.write(last["collapsed"])
+    # Same format as pstats.Stats.dump_stats, readable by pstats and snakeviz
+    with open(f"{base}.prof", "wb") as handle:
+        handle.write(last["pstats"])
+    st.session_state["last_profile_dump"] = base
+
+
+def show_profile_panel(last):
+    with st.sidebar.expander(f"Profile of rerun {last['rerun']}: {last['seconds'] * 1000:.0f} ms", expanded=True):
+        st.caption(f"{last['samples']} stack samples; model calls in worker threads are not included.")
+        used, artefacts = session_usage()
+        st.caption(f"Session memory: {used / MB:.1f} MB in {artefacts} stored artefact(s)")
+        st.dataframe(last["top"], hide_index=True, width="stretch")
+        st.download_button("Download flame graph stacks", last["collapsed"], file_name="rerun.folded",
+                           mime="text/plain")
+        # Writing to the server's disk is only offered when the operator turned profiling on
+        if os.getenv("APP_PROFILE") == "1":
+            st.button("Write profile to disk", on_click=dump_profile)
+            if st.session_state.get("last_profile_dump"):
+                st.caption(f"Written to {st.session_state['last_profile_dump']}.folded and .prof")
+
+
+# Profile the body of one script run with cProfile and a stack sampler, then show the result in the
+# sidebar. When profiling is off this is a single check and the body runs untouched.
+@contextmanager
+def profiled_rerun():
+    if not profiling_enabled():
+        yield
+        return
+    profile = cProfile.Profile()
+    sampler = StackSampler(threading.get_ident())
+    started = time.perf_counter()
+    sampler.start()
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        sampler.stop()
+        seconds = time.perf_counter() - started
+        stats = pstats.Stats(profile)
+        rerun = st.session_state.get("profile_reruns", 0) + 1
+        st.session_state["profile_reruns"] = rerun
+        last = {"rerun": rerun, "seconds": seconds, "top": top_functions(stats),
+                "collapsed": sampler.collapsed(), "samples": sum(sampler.stacks.values()),
+                "pstats": marshal.dumps(stats.stats)}
+        remember("last_profile", last)
+        show_profile_panel(last)
@@ -0,0 +1,113 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+# Raised instead of calling the model while it is failing; the message is safe to show to users
+class ModelUnavailable(Exception):
+    pass
+
+
+class ModelTimeout(ModelUnavailable):
+    pass
+
+
+# Whether an error means the backend is degraded (timeouts, throttling, 5xx, connection problems),
+# as opposed to a bad request or an invalid key that only affects one caller
+def is_backend_failure(error):
+    if isinstance(error, (ModelTimeout, TimeoutError, ConnectionError)):
+        return True
+    code = getattr(error, "code", None)
+    return isinstance(code, int) and (code == 429 or code >= 500)
+
+
+def is_throttled(error):
+    return getattr(error, "code", None) == 429
+
+
+# Circuit breaker: opens after `failures` consecutive failures, rejects calls for reset_seconds,
+# then lets a single trial call through (half-open) and closes again if it succeeds
+class CircuitBreaker:
+    def __init__(self, failures=5, reset_seconds=30):
+        self.failures = failures
+        self.reset_seconds = reset_seconds
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half-open"
+        return "open"
+
+    def allow(self):
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self.trial_running:
+                self.trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.consecutive_failures = 0
+            self.opened_at = None
+            self.trial_running = False
+
+    # An outcome that says nothing about the backend's health (a bad request, a caller's own quota): frees
+    # the half-open trial slot but leaves the failure count and open state as they were
+    def record_neutral(self):
+        with self._lock:
+            self.trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            self.trial_running = False
+            if self.opened_at is not None or self.consecutive_failures >= self.failures:
+                self.opened_at = time.monotonic()
+
+
+# Run fn on a bounded pool with an overall timeout. With hedge_after set, a duplicate call is started
+# if the first has not answered by then (or has already failed with a backend failure a retry could
+# get past), and the first success wins.
+def call_with_timeout(executor, fn, timeout, hedge_after=None):
+    started = time.monotonic()
+    pending = {executor.submit(fn)}
+    can_hedge = hedge_after is not None and hedge_after < timeout
+    error = None
+    while pending:
+        elapsed = time.monotonic() - started
+        if elapsed >= timeout:
+            break
+        limit = timeout - elapsed
+        if can_hedge:
+            limit = min(limit, max(0.0, hedge_after - elapsed))
+        done, pending = wait(pending, timeout=limit, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                for other in pending:
+                    other.cancel()
+                return future.result()
+            error = future.exception()
+        # A bad request or an invalid key fails the same way on a second try
+        if not pending and error is not None and not is_backend_failure(error):
+            raise error
+        if can_hedge and (not pending or time.monotonic() - started >= hedge_after):
+            pending.add(executor.submit(fn))
+            can_hedge = False
+    for future in pending:
+        future.cancel()
+    if error is not None and not pending:
+        raise error
+    raise ModelTimeout("The AI service took too long to respond. Please try again in a moment.")
+
+
+def make_executor(max_workers):
+    return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="llm")
@@ -0,0 +1,128 @@
+import os
+
+from sections import section_hash, segment_resume
+
+
+def section_weights(sections):
+    total = sum(len(body) for body in sections.values()) or 1
+    return {name: len(body) / total for name, body in sections.items()}
+
+
+# Snapshot of one analysed resume version: section hashes, each section's share of the text and the result
+def make_version(text, result, previous=None, jd_key=None):
+    sections = segment_resume(text)
+    return {
+        "number": previous["number"] + 1 if previous else 1,
+        "hashes": {name: section_hash(body) for name, body in sections.items()},
+        "weights": section_weights(sections),
+        "jd_key": jd_key,
+        "result": result,
+    }
+
+
+# Compare a new extraction with the previous version. Returns the sections of the new text and
+# the names of the changed (or new), unchanged and removed sections.
+def diff_sections(previous, text):
+    sections = segment_resume(text)
+    hashes = previous["hashes"] if previous else {}
+    changed = [name for name, body in sections.items() if hashes.get(name) != section_hash(body)]
+    unchanged = [name for name in sections if name not in changed]
+    removed = [name for name in hashes if name not in sections]
+    return sections, changed, unchanged, removed
+
+
+# Whether a revision is small enough to re-score only its changed sections. A first upload, a different
+# JD or edits to more than REANALYSIS_FULL_THRESHOLD of the text fall back to a full analysis.
+def can_reuse(previous, sections, changed, jd_key=None):
+    if not previous or previous["jd_key"] != jd_key or not previous["result"].get("Section_Scores"):
+        return False
+    if not changed:
+        return True
+    total = sum(len(body) for body in sections.values()) or 1
+    changed_share = sum(len(sections[name]) for name in changed) / total
+    return changed_share <= float(os.getenv("REANALYSIS_FULL_THRESHOLD", "0.6"))
+
+
+# Text of the changed sections, labelled with their names, for the revision prompts
+def format_sections(sections, names):
+    return "\n\n".join(f"[{name}]\n{sections[name]}" for name in names)
+
+
+def _as_score(value):
+    try:
+        return float(str(value).rstrip("%"))
+    except ValueError:
+        return 0.0
+
+
+# Move the previous overall score by the length-weighted change in section scores
+def merge_score(previous_score, previous, section_scores, weights):
+    old = sum(_as_score(previous["result"]["Section_Scores"].get(name, 0)) * weight
+              for name, weight in previous["weights"].items())
+    new = sum(_as_score(section_scores.get(name, 0)) * weight for name, weight in weights.items())
+    return round(min(100.0, max(0.0, _as_score(previous_score) + new - old)), 1)
+
+
+# Merge the section scores of a revision into the previous ones, dropping removed sections
+def merge_section_scores(previous, new_scores, sections):
+    merged = {name: score for name, score in previous["result"]["Section_Scores"].items() if name in sections}
+    merged.update({name: score for name, score in (new_scores or {}).items() if name in sections})
+    return merged
+
+
+# Keep previous keywords that still appear in the resume and add the ones found in the changed sections
+def merge_keywords(previous_keywords, new_keywords, text):
+    lowered = text.lower()
+    merged = [keyword for keyword in previous_keywords if keyword.lower() in lowered]
+    seen = {keyword.lower() for keyword in merged}
+    for keyword in new_keywords or []:
+        if keyword.lower() not in seen:
+            merged.append(keyword)
+            seen.add(keyword.lower())
+    return merged
+
+
+def _dedupe(keywords):
+    seen = set()
+    unique = []
+    for keyword in keywords:
+        if keyword.lower() not in seen:
+            seen.add(keyword.lower())
+            unique.append(keyword)
+    return unique
+
+
+# Merge an ats_resume_revision answer into the previous ATS analysis
+def merge_ats_revision(previous, revision, sections, text):
+    result = previous["result"]
+    scores = merge_section_scores(previous, revision.get("Section_Scores"), sections)
+    return dict(
+        result,
+        ATS_Score=merge_score(result["ATS_Score"], previous, scores, section_weights(sections)),
+        Section_Scores=scores,
+        Strengths=revision.get("Strengths") or result["Strengths"],
+        Improvements=revision.get("Improvements") or result["Improvements"],
+        Keywords=merge_keywords(result["Keywords"], revision.get("Keywords"), text),
+        Formatting=revision.get("Formatting") or result["Formatting"],
+    )
+
+
+# Merge an ats_resume_jd_revision answer into the previous compatibility analysis. JD keywords that
+# no longer appear in the resume move back to the missing list.
+def merge_ats_jd_revision(previous, revision, sections, text):
+    result = previous["result"]
+    scores = merge_section_scores(previous, revision.get("Section_Scores"), sections)
+    matched = merge_keywords(result["Matched_Keywords"], revision.get("Matched_Keywords"), text)
+    matched_lower = {keyword.lower() for keyword in matched}
+    missing = _dedupe([keyword for keyword in result["Missing_Keywords"] + result["Matched_Keywords"]
+                       if keyword.lower() not in matched_lower])
+    return dict(
+        result,
+        ATS_Compatibility_Score=merge_score(result["ATS_Compatibility_Score"], previous, scores,
+                                            section_weights(sections)),
+        Section_Scores=scores,
+        Matched_Keywords=matched,
+        Missing_Keywords=missing,
+        Improvement_Suggestions=revision.get("Improvement_Suggestions") or result["Improvement_Suggestions"],
+        Overall_Assessment=revision.get("Overall_Assessment") or result["Overall_Assessment"],
+    )
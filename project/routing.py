@@ -0,0 +1,90 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+
+DEFAULT_ROUTES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "model_routes.json")
+
+
+def load_routes(path=None):
+    with open(path or os.getenv("MODEL_ROUTES_PATH", DEFAULT_ROUTES_PATH), encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+# Rolling latency and error statistics for one model over its last `window` calls. Samples older than
+# max_age seconds are ignored, so a model skipped for breaching the SLO gets retried once they expire.
+class ModelHealth:
+    def __init__(self, window, max_age):
+        self.samples = deque(maxlen=window)
+        self.max_age = max_age
+        self._lock = threading.Lock()
+
+    def record(self, seconds, ok):
+        with self._lock:
+            self.samples.append((time.monotonic(), seconds, ok))
+
+    def stats(self):
+        cutoff = time.monotonic() - self.max_age
+        with self._lock:
+            samples = [(seconds, ok) for recorded, seconds, ok in self.samples if recorded >= cutoff]
+        if not samples:
+            return {"count": 0, "p95": 0.0, "error_rate": 0.0}
+        latencies = sorted(seconds for seconds, ok in samples if ok)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else 0.0
+        errors = sum(1 for _seconds, ok in samples if not ok)
+        return {"count": len(samples), "p95": p95, "error_rate": errors / len(samples)}
+
+
+# Picks a model per feature and input size from model_routes.json, skipping any tier whose
+# recent p95 latency or error rate breaches the SLO
+class ModelRouter:
+    def __init__(self, routes=None):
+        self.routes = routes or load_routes()
+        self.slo = self.routes.get("slo", {})
+        self.health = {}
+        self._lock = threading.Lock()
+
+    def _health(self, model):
+        with self._lock:
+            if model not in self.health:
+                self.health[model] = ModelHealth(self.slo.get("window", 50), self.slo.get("max_age_seconds", 300))
+            return self.health[model]
+
+    def tiers_for(self, feature, input_chars):
+        rules = self.routes["features"].get(feature) or self.routes["default"]
+        for rule in rules:
+            if input_chars <= rule.get("max_chars", float("inf")):
+                return rule["tiers"]
+        return rules[-1]["tiers"]
+
+    def breaches_slo(self, model):
+        stats = self._health(model).stats()
+        if stats["count"] < self.slo.get("min_samples", 5):
+            return False
+        return (stats["p95"] > self.slo.get("p95_seconds", float("inf"))
+                or stats["error_rate"] > self.slo.get("error_rate", 1.0))
+
+    # Return (model, tier) for a request. When every tier is breaching, the last (fastest) one is used.
+    def choose(self, feature, input_chars=0):
+        tiers = self.tiers_for(feature, input_chars)
+        for tier in tiers:
+            model = self.routes["tiers"][tier]
+            if not self.breaches_slo(model):
+                return model, tier
+        return self.routes["tiers"][tiers[-1]], tiers[-1]
+
+    # Delay before hedging a call to this model: its recent p95, once there are enough samples
+    def hedge_delay(self, model, default, minimum):
+        stats = self._health(model).stats()
+        if stats["count"] < self.slo.get("min_samples", 5) or not stats["p95"]:
+            return default
+        return max(minimum, stats["p95"])
+
+    def record(self, model, seconds, ok):
+        self._health(model).record(seconds, ok)
+
+    def snapshot(self):
+        with self._lock:
+            models = list(self.health)
+        return {model: self._health(model).stats() for model in models}
@@ -0,0 +1,77 @@
+import hashlib
+import re
+from collections import OrderedDict
+
+from cache import TTLCache
+
+HEADER = "Header"
+SECTION_ALIASES = {
+    "Summary": ["summary", "professional summary", "profile", "professional profile", "objective",
+                "career objective", "about me", "about"],
+    "Skills": ["skills", "technical skills", "key skills", "core skills", "core competencies", "competencies",
+               "skills and abilities", "technologies", "tools and technologies", "expertise"],
+    "Experience": ["experience", "work experience", "professional experience", "work history", "employment",
+                   "employment history", "career history", "relevant experience"],
+    "Education": ["education", "academic background", "education and training", "qualifications",
+                  "academic qualifications"],
+    "Certifications": ["certifications", "certification", "certificates", "licenses and certifications",
+                       "licenses & certifications", "courses", "training"],
+    "Projects": ["projects", "personal projects", "key projects", "academic projects", "selected projects"],
+}
+HEADING_LOOKUP = {alias: name for name, aliases in SECTION_ALIASES.items() for alias in aliases}
+HEADING_CLEAN_RE = re.compile(r"[^a-z& ]+")
+MAX_HEADING_CHARS = 40
+# Segmented resumes keyed by content hash, shared by every feature and session in the process
+SEGMENT_CACHE = TTLCache(maxsize=256, ttl=3600)
+
+
+# Canonical section name for a heading line, or None for ordinary text
+def heading_name(line):
+    line = line.strip()
+    if not line or len(line) > MAX_HEADING_CHARS:
+        return None
+    key = " ".join(HEADING_CLEAN_RE.sub(" ", line.lower()).split())
+    return HEADING_LOOKUP.get(key)
+
+
+# Split resume text into sections by heading. Text before the first heading (name and contact details)
+# goes into "Header"; a heading seen twice appends to the same section.
+def split_sections(text):
+    sections = OrderedDict()
+    current = HEADER
+    for line in (text or "").splitlines():
+        name = heading_name(line)
+        if name:
+            current = name
+            sections.setdefault(current, [])
+            continue
+        sections.setdefault(current, []).append(line)
+    return OrderedDict(
+        (name, "\n".join(lines).strip()) for name, lines in sections.items() if "\n".join(lines).strip()
+    )
+
+
+def section_hash(text):
+    return hashlib.sha1(" ".join(text.split()).encode("utf-8")).hexdigest()
+
+
+# split_sections, cached per resume content. Callers must not modify the result.
+def segment_resume(text):
+    key = section_hash(text or "")
+    sections = SEGMENT_CACHE.get(key)
+    if sections is None:
+        sections = split_sections(text)
+        SEGMENT_CACHE.set(key, sections)
+    return sections
+
+
+# The parts of a resume a feature consumes: the Header plus the named sections, under their headings.
+# Falls back to the whole text when the resume has no recognisable headings or none of the sections.
+def select_sections(text, names):
+    sections = segment_resume(text)
+    wanted = [name for name in sections if name in names]
+    if not wanted:
+        return text, []
+    blocks = [sections[HEADER]] if HEADER in sections else []
+    blocks.extend(f"{name}\n{sections[name]}" for name in wanted)
+    return "\n\n".join(blocks), wanted
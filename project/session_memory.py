@@ -0,0 +1,144 @@
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+
+import streamlit as st
+
+MB = 1024 * 1024
+_MISSING = object()
+
+
+# Approximate memory held by a value: the object itself plus everything reachable through containers,
+# counting shared objects once. NumPy arrays count their buffer.
+def approx_size(value, seen=None):
+    seen = set() if seen is None else seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(approx_size(k, seen) + approx_size(v, seen) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(approx_size(item, seen) for item in value)
+    elif hasattr(value, "nbytes"):
+        size += value.nbytes
+    return size
+
+
+# Large per-session artefacts (results and the texts they were computed from, resume versions, profiles),
+# held in one process-wide LRU store with byte accounting instead of in st.session_state. Each session
+# is capped at session_bytes and all sessions together at global_bytes; the least recently used artefacts
+# are evicted first. Streamlit does not say when a session ends, so sessions not seen for idle_seconds are
+# dropped whole, long before the global cap would have to evict them.
+class ArtefactStore:
+    def __init__(self, session_bytes=None, global_bytes=None, idle_seconds=None):
+        self.session_bytes = session_bytes or int(float(os.getenv("SESSION_MEMORY_MB", "16")) * MB)
+        self.global_bytes = global_bytes or int(float(os.getenv("SESSION_MEMORY_GLOBAL_MB", "512")) * MB)
+        self.idle_seconds = idle_seconds or float(os.getenv("SESSION_MEMORY_IDLE_MINUTES", "30")) * 60
+        self._data = OrderedDict()
+        self._usage = Counter()
+        self._seen = {}
+        self._lock = threading.Lock()
+        self._swept_at = time.monotonic()
+        self.total = 0
+        self.evictions = 0
+        self.expired_sessions = 0
+
+    # Note that a session is active, and drop idle sessions; sweeps at most once a minute (or per idle_seconds
+    # when that is shorter), so this stays cheap on every access
+    def _touch(self, session):
+        now = time.monotonic()
+        self._seen[session] = now
+        if now - self._swept_at < min(60.0, self.idle_seconds):
+            return
+        self._swept_at = now
+        idle = {item for item, seen in self._seen.items() if now - seen > self.idle_seconds}
+        if not idle:
+            return
+        for item in [item for item in self._data if item[0] in idle]:
+            self._remove(item)
+        for item in idle:
+            del self._seen[item]
+        self.expired_sessions += len(idle)
+
+    def get(self, session, key, default=None):
+        with self._lock:
+            self._touch(session)
+            entry = self._data.get((session, key), _MISSING)
+            if entry is _MISSING:
+                return default
+            self._data.move_to_end((session, key))
+            return entry[0]
+
+    def _remove(self, item):
+        _value, size = self._data.pop(item)
+        self._usage[item[0]] -= size
+        if not self._usage[item[0]]:
+            del self._usage[item[0]]
+        self.total -= size
+
+    # Store an artefact, evicting this session's least recently used ones past the session cap, then
+    # anyone's past the global cap. Returns False when the artefact alone is over the session cap.
+    def set(self, session, key, value):
+        size = approx_size(value)
+        with self._lock:
+            self._touch(session)
+            if (session, key) in self._data:
+                self._remove((session, key))
+            if size > self.session_bytes:
+                return False
+            while self._usage[session] + size > self.session_bytes:
+                self._remove(next(item for item in self._data if item[0] == session))
+                self.evictions += 1
+            while self.total + size > self.global_bytes:
+                self._remove(next(iter(self._data)))
+                self.evictions += 1
+            self._data[(session, key)] = (value, size)
+            self._usage[session] += size
+            self.total += size
+            return True
+
+    def delete(self, session, key):
+        with self._lock:
+            if (session, key) in self._data:
+                self._remove((session, key))
+
+    # Bytes and artefacts held by one session
+    def usage(self, session):
+        with self._lock:
+            return self._usage.get(session, 0), sum(1 for item in self._data if item[0] == session)
+
+    def stats(self):
+        with self._lock:
+            return {"bytes": self.total, "artefacts": len(self._data), "sessions": len(self._usage),
+                    "evictions": self.evictions, "expired_sessions": self.expired_sessions}
+
+
+ARTEFACTS = ArtefactStore()
+
+
+# Id of the current Streamlit session, kept in its session state
+def session_id():
+    if "memory_session" not in st.session_state:
+        st.session_state["memory_session"] = uuid.uuid4().hex
+    return st.session_state["memory_session"]
+
+
+# Store a large artefact for the current session; it may be evicted later, so read it back with recall
+def remember(key, value):
+    return ARTEFACTS.set(session_id(), key, value)
+
+
+def recall(key, default=None):
+    return ARTEFACTS.get(session_id(), key, default)
+
+
+def forget(key):
+    ARTEFACTS.delete(session_id(), key)
+
+
+def session_usage():
+    return ARTEFACTS.usage(session_id())
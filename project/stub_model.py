@@ -0,0 +1,100 @@
+import json
+import os
+import random
+import re
+import time
+from collections import deque
+
+PARAGRAPH_MARKER_RE = re.compile(r"^\[(\d+)\]$", re.MULTILINE)
+QUESTION_LINE_RE = re.compile(r"^\d+\. (.+)$", re.MULTILINE)
+SECTION_MARKER_RE = re.compile(r"^\[([A-Za-z]+)\]$", re.MULTILINE)
+# Prompts answered and the API key each was sent with, newest last, for checks in load tests
+STUB_CALLS = deque(maxlen=10000)
+
+
+def _json(value):
+    return json.dumps(value, indent=2)
+
+
+def _section_scores(prompt):
+    names = SECTION_MARKER_RE.findall(prompt.payload)
+    if not names and "Resume Sections:\n" in prompt.payload:
+        names = prompt.payload.split("Resume Sections:\n", 1)[1].split("\n", 1)[0].split(", ")
+    return {name: 70 for name in names}
+
+
+def _interview_answers(prompt):
+    questions = QUESTION_LINE_RE.findall(prompt.payload.split("Interview Questions:")[-1])
+    return {"Interview_Questions": [{
+        "Question": question,
+        "STAR_Answer": {"Situation": "Stub situation.", "Task": "Stub task.", "Action": "Stub action.",
+                        "Result": "Stub result."},
+        "Additional_Tips": ["Keep it concise."],
+    } for question in questions]}
+
+
+# Canned answers per prompt template, shaped like real model output, for offline runs and load tests
+STUB_RESPONSES = {
+    "keyword_suggestions": lambda p: "- Add the missing keywords to your skills section.",
+    "ats_resume": lambda p: _json({
+        "ATS_Score": 72, "Strengths": ["Clear structure"], "Improvements": ["Quantify achievements"],
+        "Keywords": ["Python", "SQL"], "Formatting": "Readable single-column layout.",
+        "Section_Scores": _section_scores(p),
+    }),
+    "ats_resume_revision": lambda p: _json({
+        "Section_Scores": _section_scores(p), "Strengths": ["Clear structure"],
+        "Improvements": ["Quantify achievements"], "Keywords": ["Python"], "Formatting": "Unchanged.",
+    }),
+    "ats_resume_jd": lambda p: _json({
+        "ATS_Compatibility_Score": 68, "Matched_Keywords": ["Python"], "Missing_Keywords": ["Kubernetes"],
+        "Improvement_Suggestions": ["Mention container experience"], "Overall_Assessment": "A reasonable fit.",
+        "Section_Scores": _section_scores(p),
+    }),
+    "ats_resume_jd_revision": lambda p: _json({
+        "Section_Scores": _section_scores(p), "Matched_Keywords": ["Python"],
+        "Improvement_Suggestions": ["Mention container experience"], "Overall_Assessment": "A reasonable fit.",
+    }),
+    "content_suggestions": lambda p: "- Tighten the opening sentence.\n- Quantify the main achievement.",
+    "paragraph_suggestions": lambda p: _json({"Paragraphs": [
+        {"Paragraph": int(number), "Suggestions": ["Tighten this paragraph."]}
+        for number in PARAGRAPH_MARKER_RE.findall(p.payload)
+    ]}),
+    "generate_resume": lambda p: "Resume Outline:\n- Summary\n  - Stub bullet\n\nCover Letter:\nDear Hiring Manager,",
+    "analyze_jd": lambda p: _json({
+        "Essential_Skills": ["Python", "SQL"], "Key_Qualifications": ["Degree in a quantitative field"],
+        "Main_Responsibilities": ["Build reports"], "Company_Culture": ["Collaborative"],
+        "Resume_Keywords": ["Python", "SQL", "Tableau"],
+    }),
+    "company_info": lambda p: "## History\nStub history.\n\n## Products\nStub products.",
+    "linkedin": lambda p: _json({
+        "Profile_Strength": 64, "Strengths": ["Complete work history"], "Improvements": ["Add a headline"],
+        "Visibility_Suggestions": ["Post weekly"], "Keyword_Recommendations": ["Data Analysis"],
+        "Content_Ideas": ["Share a project write-up"],
+    }),
+    "interview_questions": lambda p: _json({"Interview_Questions": [f"Stub question {i}?" for i in range(1, 11)]}),
+    "interview_answers": lambda p: _json(_interview_answers(p)),
+    "skill_gap": lambda p: _json({
+        "Skills_in_Resume": ["Python", "SQL"], "Skills_Required": ["Python", "Kubernetes", "Terraform"],
+        "Skill_Gaps": ["Kubernetes", "Terraform"],
+    }),
+}
+
+
+# Simulated model latency in seconds from LLM_STUB_LATENCY: a fixed value ("0.8") or a range ("0.3-1.5")
+def stub_latency():
+    value = os.getenv("LLM_STUB_LATENCY", "0.5")
+    if "-" in value:
+        low, high = (float(part) for part in value.split("-", 1))
+        return random.uniform(low, high)
+    return float(value)
+
+
+# Offline stand-in for a model call, used when LLM_BACKEND=stub. Honours max_output_tokens
+# (at roughly four characters per token) so output caps can be exercised offline.
+def stub_generate(prompt, model_name=None, config=None, api_key=None):
+    STUB_CALLS.append((str(prompt), api_key))
+    time.sleep(stub_latency())
+    response = STUB_RESPONSES.get(getattr(prompt, "name", None))
+    text = response(prompt) if response else "OK"
+    cap = (config or {}).get("max_output_tokens")
+    return text[:cap * 4] if cap else text
@@ -0,0 +1,53 @@
+import threading
+
+import pytest
+
+glm = pytest.importorskip("google.ai.generativelanguage")
+
+import llm  # noqa: E402
+from cache import TTLCache  # noqa: E402
+
+KEYS = 16
+CALLS_PER_KEY = 4
+
+
+# Stands in for glm.GenerativeServiceClient: remembers the key it was created with and prefixes every
+# answer with it, so an answer shows which key's client sent the call
+class FakeServiceClient:
+    def __init__(self, client_options=None, **_kwargs):
+        self.api_key = (client_options or {}).get("api_key")
+
+    def generate_content(self, request, timeout=None):
+        part = glm.Part(text=f"{self.api_key} {request.contents[0].parts[0].text}")
+        return glm.GenerateContentResponse(candidates=[glm.Candidate(content=glm.Content(parts=[part]))])
+
+
+# Many threads calling the model at once through the real per-key client path, each with its own key:
+# every call must be answered by its own key's client, and there must be one client per key
+def test_concurrent_calls_use_their_own_key_client(monkeypatch):
+    monkeypatch.setattr(glm, "GenerativeServiceClient", FakeServiceClient)
+    monkeypatch.setattr(llm, "CLIENTS", TTLCache(maxsize=256, ttl=3600))
+    monkeypatch.delenv("LLM_BACKEND", raising=False)
+    monkeypatch.delenv("LLM_CASSETTE_MODE", raising=False)
+    problems = []
+
+    def call(number):
+        api_key = f"fake-key-{number % KEYS}"
+        prompt = f"prompt {number}"
+        try:
+            answer = llm.generate_text(prompt, feature="validate", api_key=api_key)
+        except Exception as e:
+            problems.append(f"{prompt}: {e}")
+            return
+        if answer != f"{api_key} {prompt}":
+            problems.append(f"{prompt} sent with {api_key} was answered by client {answer.split()[0]}")
+
+    threads = [threading.Thread(target=call, args=(number,)) for number in range(KEYS * CALLS_PER_KEY)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert problems == []
+    for number in range(KEYS):
+        assert llm.CLIENTS.get(f"fake-key-{number}").api_key == f"fake-key-{number}"
@@ -0,0 +1,109 @@
+import math
+import re
+from collections import Counter
+
+PAGE_NUMBER_RE = re.compile(r"^(page\s*)?[-–(\[]?\s*\d{1,3}\s*[-–)\]]?(\s*(of|/)\s*\d{1,3})?$", re.IGNORECASE)
+# A page number inside a running header or footer ("Page 2", "2 of 5", "2/5")
+PAGE_NUMBER_IN_LINE_RE = re.compile(r"\bpage\s*\d{1,3}(\s*(of|/)\s*\d{1,3})?\b|\b\d{1,3}\s*(of|/)\s*\d{1,3}\b",
+                                    re.IGNORECASE)
+HYPHEN_BREAK_RE = re.compile(r"(\w+)-\n\s*([a-z]\w*)")
+SOFT_HYPHEN_BREAK_RE = re.compile(r"\u00ad\n?\s*")
+WORD_RE = re.compile(r"\w+")
+SPACES_RE = re.compile(r"[ \t\u00a0\u2000-\u200b\u3000]+")
+BLANK_LINES_RE = re.compile(r"\n{3,}")
+
+# Lines this long are body text, not running headers or footers
+MAX_REPEATED_LINE_CHARS = 120
+# Running headers and footers sit in the first or last few lines of a page
+EDGE_LINES = 3
+# Fewer pages than this are too few to tell a running header from content that happens to repeat
+MIN_PAGES_FOR_REPEATS = 3
+
+
+# Rough token count for Gemini-style tokenisers (about four characters per token for English text)
+def estimate_tokens(text):
+    return math.ceil(len(text) / 4)
+
+
+# Key used to spot the same header or footer on different pages: only page numbers are masked,
+# so "Page 2 of 3" and "Page 3 of 3" match but "2015 - 2018" and "2019 - 2021" do not
+def _line_key(line):
+    return PAGE_NUMBER_IN_LINE_RE.sub("#", line.casefold())
+
+
+# Non-empty lines within EDGE_LINES of the top or bottom of a page, by position
+def _edge_positions(lines):
+    filled = [i for i, line in enumerate(lines) if line]
+    return set(filled[:EDGE_LINES] + filled[-EDGE_LINES:])
+
+
+# Find lines that sit at the top or bottom of most pages, for documents of MIN_PAGES_FOR_REPEATS or more pages
+def _repeated_lines(pages_lines):
+    if len(pages_lines) < MIN_PAGES_FOR_REPEATS:
+        return set()
+    page_counts = Counter()
+    for lines in pages_lines:
+        page_counts.update({_line_key(lines[i]) for i in _edge_positions(lines)
+                            if len(lines[i]) <= MAX_REPEATED_LINE_CHARS})
+    return {key for key, count in page_counts.items() if count > len(pages_lines) / 2}
+
+
+# Rejoin words split across lines. Soft hyphens always join; a hard hyphen joins only when the joined
+# word appears elsewhere in the text ("manage-\nment"), otherwise it is kept ("well-\nknown" -> "well-known").
+def _rejoin_hyphens(text):
+    text = SOFT_HYPHEN_BREAK_RE.sub("", text)
+    words = {word.casefold() for word in WORD_RE.findall(HYPHEN_BREAK_RE.sub(" ", text))}
+
+    def join(match):
+        head, tail = match.groups()
+        return head + tail if (head + tail).casefold() in words else f"{head}-{tail}"
+
+    return HYPHEN_BREAK_RE.sub(join, text)
+
+
+# Clean extracted PDF pages before they go into prompts: drop page numbers, keep only the first copy of
+# running headers and footers, rejoin words hyphenated across line breaks and collapse whitespace.
+# Returns the normalised text and a stats dict with the character and token reduction.
+def normalize_pages(pages):
+    raw_text = "".join(pages)
+    pages_lines = [[SPACES_RE.sub(" ", line).strip() for line in page.splitlines()] for page in pages]
+    repeated = _repeated_lines(pages_lines)
+
+    seen = set()
+    kept = []
+    removed_lines = 0
+    for lines in pages_lines:
+        edges = _edge_positions(lines) if repeated else set()
+        for position, line in enumerate(lines):
+            if not line:
+                kept.append("")
+                continue
+            if PAGE_NUMBER_RE.match(line):
+                removed_lines += 1
+                continue
+            key = _line_key(line)
+            if position in edges and key in repeated:
+                if key in seen:
+                    removed_lines += 1
+                    continue
+                seen.add(key)
+            kept.append(line)
+        kept.append("")
+
+    text = "\n".join(kept)
+    text = _rejoin_hyphens(text)
+    text = BLANK_LINES_RE.sub("\n\n", text).strip()
+
+    raw_tokens = estimate_tokens(raw_text)
+    tokens = estimate_tokens(text)
+    stats = {
+        "raw_chars": len(raw_text),
+        "chars": len(text),
+        "raw_tokens": raw_tokens,
+        "tokens": tokens,
+        "removed_lines": removed_lines,
+        "char_reduction": 1 - len(text) / len(raw_text) if raw_text else 0.0,
+        "token_reduction": 1 - tokens / raw_tokens if raw_tokens else 0.0,
+    }
+    return text, stats
+
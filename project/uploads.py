@@ -0,0 +1,106 @@
+import hashlib
+import mmap
+import os
+import tempfile
+from contextlib import contextmanager
+
+MB = 1024 * 1024
+CHUNK_SIZE = 256 * 1024
+
+
+# Raised when an upload breaks one of the configured limits
+class UploadRejected(ValueError):
+    pass
+
+
+# Read the upload limits from the environment so each deployment can tune them
+def upload_limits():
+    return {
+        "max_bytes": int(float(os.getenv("MAX_UPLOAD_MB", "10")) * MB),
+        "max_pages": int(os.getenv("MAX_PDF_PAGES", "20")),
+        "max_chars": int(os.getenv("MAX_EXTRACTED_CHARS", "60000")),
+        "spool_bytes": int(float(os.getenv("UPLOAD_SPOOL_KB", "512")) * 1024),
+    }
+
+
+# Copy an upload into a spooled temporary file, rejecting it as soon as it passes the byte limit.
+# Small uploads stay in memory, anything above spool_bytes is written to disk. Returns the file and
+# whether it was rolled over to disk.
+def spool_upload(uploaded_file, limits):
+    max_bytes = limits["max_bytes"]
+    size = getattr(uploaded_file, "size", None)
+    if size is not None and size > max_bytes:
+        raise UploadRejected(
+            f"The uploaded file is {size / MB:.1f} MB, which is over the {max_bytes / MB:.1f} MB limit."
+        )
+
+    spooled = tempfile.SpooledTemporaryFile(max_size=limits["spool_bytes"])
+    try:
+        uploaded_file.seek(0)
+        written = 0
+        while True:
+            chunk = uploaded_file.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            written += len(chunk)
+            if written > max_bytes:
+                raise UploadRejected(f"The uploaded file is over the {max_bytes / MB:.1f} MB limit.")
+            spooled.write(chunk)
+        if written == 0:
+            raise UploadRejected("The uploaded file is empty.")
+        spooled.seek(0)
+    except BaseException:
+        spooled.close()
+        raise
+    # SpooledTemporaryFile rolls over once a write takes it past max_size
+    return spooled, written > limits["spool_bytes"]
+
+
+# Yield a read-only stream over the spooled upload: the in-memory buffer itself,
+# or a memory map when the upload was rolled over to disk
+@contextmanager
+def mapped_view(spooled, on_disk):
+    # fileno() forces a rollover, so only map files that are already on disk
+    if not on_disk:
+        spooled.seek(0)
+        yield spooled
+        return
+    with mmap.mmap(spooled.fileno(), 0, access=mmap.ACCESS_READ) as view:
+        yield view
+
+
+# Open a PDF source for parsing. Paths are memory-mapped directly, uploads are spooled first.
+@contextmanager
+def open_pdf_source(source, limits):
+    if isinstance(source, (str, os.PathLike)):
+        size = os.path.getsize(source)
+        max_bytes = limits["max_bytes"]
+        if size > max_bytes:
+            raise UploadRejected(
+                f"{os.fspath(source)} is {size / MB:.1f} MB, which is over the {max_bytes / MB:.1f} MB limit."
+            )
+        if size == 0:
+            raise UploadRejected(f"{os.fspath(source)} is empty.")
+        with open(source, "rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            yield view
+        return
+    spooled, on_disk = spool_upload(source, limits)
+    with spooled, mapped_view(spooled, on_disk) as view:
+        yield view
+
+
+# Content hash of an upload, used as the cache key for its extracted text.
+# The byte limit is checked first so oversized files are never read.
+def upload_digest(uploaded_file, limits=None):
+    limits = limits or upload_limits()
+    size = getattr(uploaded_file, "size", None)
+    if size is not None and size > limits["max_bytes"]:
+        raise UploadRejected(
+            f"The uploaded file is {size / MB:.1f} MB, which is over the {limits['max_bytes'] / MB:.1f} MB limit."
+        )
+    digest = hashlib.sha256()
+    uploaded_file.seek(0)
+    for chunk in iter(lambda: uploaded_file.read(CHUNK_SIZE), b""):
+        digest.update(chunk)
+    uploaded_file.seek(0)
+    return digest.hexdigest()
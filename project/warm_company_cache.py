@@ -0,0 +1,63 @@
+import argparse
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from dotenv import load_dotenv
+
+from company_cache import CompanyProfileCache, normalize_company_name
+from llm import KEY_POOL, generate
+from prompts import render_prompt
+
+
+def read_companies(path):
+    with open(path, encoding="utf-8") as handle:
+        names = [line.split(",")[0].strip() for line in handle]
+    unique = {}
+    for name in names:
+        if normalize_company_name(name) and not name.startswith("#"):
+            unique.setdefault(normalize_company_name(name), name)
+    return list(unique.values())
+
+
+# Pre-generate company profiles so popular lookups in the app are served from the cache
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Warm the company profile cache")
+    parser.add_argument("companies", help="Text or CSV file with one company name per line (first column)")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent model calls")
+    parser.add_argument("--refresh", action="store_true", help="Regenerate profiles that are still fresh")
+    args = parser.parse_args()
+
+    api_key = os.getenv("GOOGLE_API_KEY")
+    if not api_key and not len(KEY_POOL):
+        sys.exit("Set GOOGLE_API_KEY or GEMINI_API_KEYS to warm the cache")
+
+    cache = CompanyProfileCache()
+    companies = read_companies(args.companies)
+    pending = [name for name in companies if args.refresh or cache.get(name) is None]
+    print(f"{len(companies)} companies, {len(companies) - len(pending)} already cached, generating {len(pending)}")
+
+    failed = truncated = 0
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        futures = {executor.submit(generate, render_prompt("company_info", company=name), api_key=api_key): name
+                   for name in pending}
+        for done, future in enumerate(as_completed(futures), 1):
+            name = futures[future]
+            try:
+                generation = future.result()
+                if generation.truncated:
+                    truncated += 1
+                    print(f"[{done}/{len(pending)}] {name} skipped: cut off at the output limit", file=sys.stderr)
+                    continue
+                cache.set(name, generation.text)
+                print(f"[{done}/{len(pending)}] {name}")
+            except Exception as e:
+                failed += 1
+                print(f"[{done}/{len(pending)}] {name} failed: {e}", file=sys.stderr)
+    print(f"Done: {len(pending) - failed - truncated} generated, {truncated} truncated, {failed} failed, "
+          f"cache at {cache.path}")
+
+
+if __name__ == "__main__":
+    main()